@@ -0,0 +1,214 @@
+"""
+Enumeração preguiçosa de ciclos ("rotas que dão a volta") na rede viária.
+
+Dois geradores, sem montar a lista inteira de ciclos na memória:
+- iter_cycle_basis: a mesma base de ciclos de nx.cycle_basis, entregue um
+  ciclo por vez à medida que a busca em profundidade os encontra.
+- iter_faces: percorre as faces do desenho plano da rede usando as
+  coordenadas x/y dos nós (em cada nó os vizinhos ficam ordenados pelo
+  ângulo). As faces internas são os quarteirões e laços de ruas; a face
+  externa é o contorno da cidade. Em ruas sem saída a face passa duas vezes
+  pelos mesmos nós (ida e volta), sem alterar a área. Limitação: supõe que o
+  desenho em linha reta é plano, o que a rede viária não é: viadutos e
+  túneis cruzam outras ruas sem nó em comum. Perto desses cruzamentos as
+  faces não são quarteirões e suas áreas saem erradas; para ciclos que
+  existem de fato na rede use method="basis".
+
+iter_cycles filtra por área (m²) e perímetro (metros) e para após limit
+ciclos aceitos; com simple=True tira das faces as ruas sem saída e descarta
+as que ainda repetem nós, ficando só com ciclos simples. largest_cycles
+percorre todos os ciclos, mas guarda só os n maiores.
+"""
+from heapq import nlargest
+from math import atan2, cos, radians
+
+import networkx as nx
+
+# Raio da Terra usado pelo OSMnx para o atributo 'length' (metros)
+EARTH_RADIUS_M = 6371009
+
+
+# ==== Gerador da base de ciclos ====
+def iter_cycle_basis(graph, root=None):
+    """
+    Gera os ciclos de nx.cycle_basis um por vez, na mesma ordem (mesmo
+    algoritmo, sem acumular a lista). Cada ciclo é uma lista de nós.
+    """
+    remaining = dict.fromkeys(graph)
+    while remaining:
+        if root is None:
+            root = remaining.popitem()[0]
+        stack = [root]
+        predecessors = {root: root}
+        used = {root: set()}
+        while stack:
+            z = stack.pop()
+            z_used = used[z]
+            for neighbor in graph[z]:
+                if neighbor not in used:
+                    predecessors[neighbor] = z
+                    stack.append(neighbor)
+                    used[neighbor] = {z}
+                elif neighbor == z:
+                    yield [z]
+                elif neighbor not in z_used:
+                    neighbor_used = used[neighbor]
+                    cycle = [neighbor, z]
+                    p = predecessors[z]
+                    while p not in neighbor_used:
+                        cycle.append(p)
+                        p = predecessors[p]
+                    cycle.append(p)
+                    yield cycle
+                    used[neighbor].add(z)
+        for node in predecessors:
+            remaining.pop(node, None)
+        root = None
+
+
+# ==== Função para o número de ciclos da base ====
+def cycle_count(graph):
+    """Tamanho da base de ciclos (número ciclomático), sem enumerá-los: E - V + componentes."""
+    simple = nx.Graph(graph)
+    return simple.number_of_edges() - simple.number_of_nodes() + nx.number_connected_components(simple)
+
+
+def _projected(graph):
+    # Coordenadas em metros (equiretangular em torno da latitude média)
+    nodes = graph.nodes
+    mean_lat = radians(sum(nodes[n]["y"] for n in nodes) / max(len(nodes), 1))
+    scale = EARTH_RADIUS_M * cos(mean_lat)
+    return {n: (radians(nodes[n]["x"]) * scale, radians(nodes[n]["y"]) * EARTH_RADIUS_M) for n in nodes}
+
+
+def _signed_area(cycle, points):
+    # Fórmula do laço (shoelace); positiva no sentido anti-horário
+    total = 0.0
+    for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+        (xa, ya), (xb, yb) = points[a], points[b]
+        total += xa * yb - xb * ya
+    return total / 2
+
+
+# ==== Gerador das faces do desenho plano ====
+def iter_faces(graph, include_outer=False):
+    """
+    Gera (ciclo, área em m²) para cada face do desenho plano da rede, em que
+    ciclo é a lista de nós da fronteira. Por padrão a face externa de cada
+    componente (o contorno, percorrido no sentido oposto) é omitida.
+    Só corresponde aos quarteirões se o desenho for plano; arestas que se
+    cruzam sem nó em comum (viadutos, túneis) geram faces e áreas erradas.
+    """
+    points = _projected(graph)
+    rotation = {}
+    position = {}
+    for node in graph:
+        x, y = points[node]
+        neighbors = sorted((n for n in set(graph[node]) if n != node),
+                           key=lambda n: atan2(points[n][1] - y, points[n][0] - x))
+        rotation[node] = neighbors
+        position[node] = {n: i for i, n in enumerate(neighbors)}
+
+    visited = set()
+    for start in graph:
+        for first in rotation[start]:
+            if (start, first) in visited:
+                continue
+            face = []
+            a, b = start, first
+            while (a, b) not in visited:
+                visited.add((a, b))
+                face.append(a)
+                # Em b, vindo de a: segue pelo próximo vizinho no sentido horário
+                neighbors = rotation[b]
+                c = neighbors[(position[b][a] - 1) % len(neighbors)]
+                a, b = b, c
+            area = _signed_area(face, points)
+            # Com essa regra de giro, as faces internas saem no sentido
+            # anti-horário (área positiva) e a externa no horário
+            if area > 0 or include_outer:
+                yield face, abs(area)
+
+
+def _strip_spurs(walk):
+    # Tira as idas e voltas (a -> b -> a) das ruas sem saída, inclusive as
+    # que cruzam o início da lista, deixando a fronteira da face
+    stack = []
+    for node in walk:
+        if len(stack) >= 2 and stack[-2] == node:
+            stack.pop()
+        else:
+            stack.append(node)
+    while len(stack) > 2:
+        if stack[-1] == stack[1]:
+            stack = stack[1:-1]
+        elif stack[-2] == stack[0]:
+            stack = stack[:-2]
+        else:
+            break
+    return stack
+
+
+# ==== Função para o perímetro de um ciclo ====
+def cycle_perimeter(graph, cycle, weight="length"):
+    """Soma dos pesos das arestas do ciclo (a menor entre arestas paralelas)."""
+    total = 0.0
+    for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+        if a == b and len(cycle) > 1:
+            continue
+        data = graph[a][b]
+        if graph.is_multigraph():
+            total += min(edge.get(weight, 1) for edge in data.values())
+        else:
+            total += data.get(weight, 1)
+    return total
+
+
+# ==== Gerador filtrado ====
+def iter_cycles(graph, method="faces", min_area=0.0, min_perimeter=0.0, limit=None,
+                include_outer=False, weight="length", simple=False):
+    """
+    Gera (ciclo, área em m², perímetro) dos ciclos com área >= min_area e
+    perímetro >= min_perimeter, parando após limit ciclos aceitos.
+    method="faces" usa as faces do desenho plano (aproximadas onde a rede
+    não é plana, ver iter_faces); method="basis" usa a base de ciclos, que
+    vale para qualquer grafo (a área então é a do polígono formado pelo ciclo).
+    Com simple=True as faces perdem as ruas sem saída e as que ainda passam
+    duas vezes por um nó (como a face externa) são descartadas.
+    """
+    if method == "faces":
+        source = iter_faces(graph, include_outer)
+    elif method == "basis":
+        points = _projected(graph)
+        source = ((cycle, abs(_signed_area(cycle, points))) for cycle in iter_cycle_basis(graph))
+    else:
+        raise ValueError(f"método desconhecido: {method!r} (use 'faces' ou 'basis')")
+
+    if limit is not None and limit <= 0:
+        return
+    accepted = 0
+    for cycle, area in source:
+        if area < min_area:
+            continue
+        if simple and method == "faces":
+            cycle = _strip_spurs(cycle)
+            if len(cycle) < 3 or len(set(cycle)) < len(cycle):
+                continue
+        perimeter = cycle_perimeter(graph, cycle, weight)
+        if perimeter < min_perimeter:
+            continue
+        yield cycle, area, perimeter
+        accepted += 1
+        if limit is not None and accepted >= limit:
+            return
+
+
+# ==== Função para os maiores ciclos ====
+def largest_cycles(graph, n, by="area", **kwargs):
+    """
+    Os n maiores ciclos por "area" ou "perimeter", em ordem decrescente.
+    Percorre todos os ciclos de iter_cycles (aceita os mesmos filtros), mas
+    guarda só n de cada vez.
+    """
+    column = {"area": 1, "perimeter": 2}[by]
+    return nlargest(n, iter_cycles(graph, **kwargs), key=lambda item: item[column])
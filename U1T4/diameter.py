@@ -0,0 +1,94 @@
+"""
+Excentricidade e diâmetro exatos da rede viária com poucas buscas.
+
+graph_diameter usa varreduras duplas (double sweep / 4-sweep) para achar um
+limite inferior e um nó central u, e depois o iFUB: processa os nós em ordem
+decrescente de distância a u, calculando a excentricidade de cada um. Se t é
+a maior distância a u entre os nós ainda não processados, qualquer par entre
+eles está a no máximo 2t (passando por u); o laço para quando o limite
+inferior alcança 2t, e então ele é o diâmetro. Vale para contagem de saltos
+(weight=None) e para pesos positivos como 'length'.
+"""
+import networkx as nx
+
+
+def _unit_weight(u, v, data):
+    return 1
+
+
+def _search(graph, source, weight):
+    # Dijkstra (ou BFS com peso 1) de source: (predecessores, distâncias)
+    return nx.dijkstra_predecessor_and_distance(graph, source, weight=weight or _unit_weight)
+
+
+def _farthest(distances):
+    node = max(distances, key=distances.get)
+    return node, distances[node]
+
+
+def _midpoint(predecessors, distances, start, end):
+    # Nó do caminho de start até end mais próximo da metade da distância
+    half = distances[end] / 2
+    node = end
+    while node != start and distances[node] > half:
+        node = predecessors[node][0]
+    return node
+
+
+# ==== Função para a excentricidade de um nó ====
+def eccentricity(graph, node, weight="length"):
+    """Retorna (excentricidade, nó mais distante) de node; weight=None conta saltos."""
+    _, distances = _search(graph, node, weight)
+    if len(distances) != graph.number_of_nodes():
+        raise nx.NetworkXError("Found infinite path length because the graph is not connected")
+    farthest, ecc = _farthest(distances)
+    return ecc, farthest
+
+
+# ==== Função para o diâmetro exato (iFUB) ====
+def graph_diameter(graph, weight="length"):
+    """
+    Diâmetro exato de um grafo conexo não-direcionado. weight=None conta
+    saltos (como nx.diameter); 'length' dá o diâmetro em metros.
+    Retorna (diâmetro, (u, v), buscas): as extremidades de um caminho mínimo
+    de comprimento igual ao diâmetro e o número de buscas feitas.
+    Levanta nx.NetworkXError se o grafo não for conexo.
+    """
+    if graph.number_of_nodes() == 0:
+        raise nx.NetworkXError("diameter of an empty graph is undefined")
+    searches = 0
+
+    # Duas varreduras duplas a partir do nó de maior grau (4-sweep)
+    start = max(graph.nodes, key=graph.degree)
+    lower_bound, endpoints = 0, (start, start)
+    for _ in range(2):
+        _, distances = _search(graph, start, weight)
+        searches += 1
+        if len(distances) != graph.number_of_nodes():
+            raise nx.NetworkXError("Found infinite path length because the graph is not connected")
+        a, _ = _farthest(distances)
+        predecessors, distances = _search(graph, a, weight)
+        searches += 1
+        b, ecc = _farthest(distances)
+        if ecc > lower_bound:
+            lower_bound, endpoints = ecc, (a, b)
+        start = _midpoint(predecessors, distances, a, b)
+
+    # iFUB a partir do nó central encontrado
+    center = start
+    _, center_distances = _search(graph, center, weight)
+    searches += 1
+    farthest, ecc = _farthest(center_distances)
+    if ecc > lower_bound:
+        lower_bound, endpoints = ecc, (center, farthest)
+
+    for node in sorted(center_distances, key=center_distances.get, reverse=True):
+        if lower_bound >= 2 * center_distances[node]:
+            break
+        _, distances = _search(graph, node, weight)
+        searches += 1
+        farthest, ecc = _farthest(distances)
+        if ecc > lower_bound:
+            lower_bound, endpoints = ecc, (node, farthest)
+
+    return lower_bound, endpoints, searches
@@ -0,0 +1,138 @@
+"""
+Pares de nós mais próximos da rede viária, sem testar todos os n² pares.
+
+Com comprimentos positivos, o par mais próximo pela rede é sempre ligado por
+uma única aresta. Para os k pares mais próximos, as k menores arestas dão um
+limite D: existem k pares a distância <= D, então nenhum dos k mais próximos
+está mais longe que D. Basta um Dijkstra limitado ao raio D a partir de cada
+nó, que em malhas viárias visita só a vizinhança imediata. Seleção das k
+menores arestas em O(E log k).
+
+Pela distância em linha reta, os k pares mais próximos estão entre os k
+vizinhos mais próximos de cada nó, achados com uma KD-tree.
+"""
+from heapq import heappop, heappush, nsmallest
+from math import asin, cos, inf, radians, sin, sqrt
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Raio da Terra usado pelo OSMnx para o atributo 'length' (metros)
+EARTH_RADIUS_M = 6371009
+
+
+def _edge_weights(graph, weight):
+    # Menor peso por par de nós (arestas paralelas e laços são descartados)
+    best = {}
+    for u, v, w in graph.edges(data=weight, default=1):
+        if u == v:
+            continue
+        key = (u, v) if graph.is_directed() else frozenset((u, v))
+        if w < best.get(key, inf):
+            best[key] = w
+    return best
+
+
+def _bounded_dijkstra(graph, source, cutoff, weight, multigraph):
+    distances = {source: 0}
+    settled = set()
+    priority_queue = [(0, source)]
+    while priority_queue:
+        current_distance, current_node = heappop(priority_queue)
+        if current_node in settled:
+            continue
+        settled.add(current_node)
+        for neighbor, data in graph[current_node].items():
+            if multigraph:
+                edge_weight = min(edge.get(weight, 1) for edge in data.values())
+            else:
+                edge_weight = data.get(weight, 1)
+            distance = current_distance + edge_weight
+            if distance <= cutoff and distance < distances.get(neighbor, inf):
+                distances[neighbor] = distance
+                heappush(priority_queue, (distance, neighbor))
+    return distances
+
+
+# ==== Função para os k pares mais próximos pela rede ====
+def closest_pairs_network(graph, k=1, weight="length"):
+    """
+    Os k pares de nós distintos com menor distância pela rede, como lista de
+    (distância, u, v) em ordem crescente. Empates seguem a ordem dos nós no
+    grafo, como no laço de força bruta (u vem antes de v nessa ordem, em
+    grafos não-direcionados).
+    """
+    edge_weights = _edge_weights(graph, weight)
+    if k <= 0 or not edge_weights:
+        return []
+    smallest = nsmallest(k, edge_weights.values())
+    cutoff = smallest[-1] if len(smallest) == k else inf
+
+    position = {node: i for i, node in enumerate(graph.nodes)}
+    directed = graph.is_directed()
+    multigraph = graph.is_multigraph()
+    candidates = {}
+    for source in graph.nodes:
+        for target, distance in _bounded_dijkstra(graph, source, cutoff, weight, multigraph).items():
+            if target == source:
+                continue
+            if directed:
+                key = (source, target)
+            elif position[source] < position[target]:
+                key = (source, target)
+            else:
+                continue
+            candidates[key] = distance
+
+    ranked = nsmallest(k, candidates.items(),
+                       key=lambda item: (item[1], position[item[0][0]], position[item[0][1]]))
+    return [(distance, u, v) for (u, v), distance in ranked]
+
+
+# ==== Função para os k pares mais próximos em linha reta ====
+def closest_pairs_euclidean(graph, k=1):
+    """
+    Os k pares de nós distintos mais próximos em linha reta (atributos x/y do
+    OSMnx), como lista de (distância em metros, u, v) em ordem crescente.
+    """
+    nodes = list(graph.nodes)
+    if k <= 0 or len(nodes) < 2:
+        return []
+    lon = np.radians([graph.nodes[n]["x"] for n in nodes])
+    lat = np.radians([graph.nodes[n]["y"] for n in nodes])
+    # Projeção equiretangular local (metros), suficiente para ordenar vizinhos numa cidade
+    points = np.column_stack((lon * np.cos(lat.mean()), lat)) * EARTH_RADIUS_M
+    neighbors = min(k + 1, len(nodes))
+    _, indices = cKDTree(points).query(points, k=neighbors)
+
+    candidates = set()
+    for i, row in enumerate(indices.tolist()):
+        for j in row:
+            if j != i:
+                candidates.add((min(i, j), max(i, j)))
+
+    def haversine(i, j):
+        a = (sin((lat[j] - lat[i]) / 2) ** 2
+             + cos(lat[i]) * cos(lat[j]) * sin((lon[j] - lon[i]) / 2) ** 2)
+        return 2 * EARTH_RADIUS_M * asin(sqrt(min(a, 1.0)))
+
+    ranked = nsmallest(k, ((haversine(i, j), i, j) for i, j in candidates))
+    return [(distance, nodes[i], nodes[j]) for distance, i, j in ranked]
+
+
+# ==== Referência de força bruta (só para grafos pequenos) ====
+def closest_pair_bruteforce(graph, weight="length"):
+    """O laço original (n² consultas de menor caminho), para validação: retorna (distância, u, v)."""
+    import networkx as nx
+
+    min_path_length, min_path = inf, None
+    for node1 in graph:
+        for node2 in graph:
+            if node1 != node2:
+                try:
+                    length = nx.shortest_path_length(graph, node1, node2, weight=weight)
+                except nx.NetworkXNoPath:
+                    continue
+                if length < min_path_length:
+                    min_path_length, min_path = length, (node1, node2)
+    return (min_path_length, *min_path) if min_path else None
@@ -1,14 +1,23 @@
 # Importar as bibliotecas necessárias
+import os
+import sys
 import osmnx as ox
 import networkx as nx
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from osm_cache import load_graph
+from nearest_pairs import closest_pairs_euclidean, closest_pairs_network
+from diameter import graph_diameter
+from cycles import cycle_count, largest_cycles
+
 # Definir a cidade para análise
 cidade = "Natal, Rio Grande do Norte, Brazil"
 
-# Baixar os dados da rede de ruas da cidade
-print("Baixando dados da rede de ruas...")
-G = ox.graph_from_place(cidade, network_type='drive')
+# Carregar a rede de ruas da cidade (cache em disco; opcionalmente um arquivo local)
+print("Carregando dados da rede de ruas...")
+graph_path = sys.argv[1] if len(sys.argv) > 1 else None
+G = load_graph(cidade, network_type='drive', path=graph_path)
 
 # Converter o Multigraph em um Graph simples (removendo múltiplas arestas)
 # OSMnx já oferece a função get_undirected() que lida com isso.
@@ -21,14 +30,22 @@ fig, ax = ox.plot_graph(G_simple, node_size=5, node_color='blue', edge_color='gr
 
 # === 1. Quais possíveis rotas para dar a volta na cidade? ===
 print("Identificando ciclos que dão a volta na cidade...")
-cycles = list(nx.cycle_basis(G_simple))
-print(f"Número de ciclos identificados: {len(cycles)}")
+# Tamanho da base de ciclos (E - V + componentes), sem montar a lista de ciclos
+num_cycles = cycle_count(G_simple)
+print(f"Número de ciclos identificados: {num_cycles}")
+
+# Maiores laços pela área envolvida, percorrendo as faces internas do desenho
+# da rede (ver cycles.py), sem as ruas sem saída e só os ciclos simples: a
+# face externa passa várias vezes pelos mesmos nós e não é um ciclo
+loops = largest_cycles(G_simple, 5, by="area", simple=True)
+for i, (cycle, area, perimeter) in enumerate(loops, 1):
+    print(f"Laço {i}: {len(cycle)} nós, área de {area / 1e6:.2f} km², perímetro de {perimeter / 1000:.2f} km")
 
-# Plotar um ciclo (subgrafo) para visualização de uma rota que dá a volta na cidade
-if cycles:
-    cycle_subgraph = G_simple.subgraph(cycles[0])  # Pegar o primeiro ciclo para exibir
+# Plotar o maior laço (subgrafo) para visualização de uma rota que dá a volta na cidade
+if loops:
+    cycle_subgraph = G_simple.subgraph(loops[0][0])
     fig, ax = ox.plot_graph(cycle_subgraph, node_size=5, node_color='red', edge_color='blue', show=True)
-    print("Exemplo de ciclo plotado (uma possível rota que dá a volta).")
+    print("Maior ciclo plotado (uma possível rota que dá a volta).")
 else:
     print("Nenhum ciclo foi encontrado.")
 
@@ -39,25 +56,32 @@ print("Calculando os pontos mais afastados (diâmetro)...")
 try:
     largest_component = max(nx.connected_components(G_simple), key=len)
     subgraph = G_simple.subgraph(largest_component).copy()
-    diameter = nx.diameter(subgraph)
-    print(f"Diâmetro (maior distância entre dois pontos): {diameter}")
+    # Diâmetro exato com poucas buscas (iFUB, ver diameter.py), em saltos e em metros
+    diameter_hops, _, searches_hops = graph_diameter(subgraph, weight=None)
+    diameter, diameter_endpoints, searches = graph_diameter(subgraph, weight='length')
+    print(f"Diâmetro em número de ruas: {diameter_hops} ({searches_hops} buscas)")
+    print(f"Diâmetro (maior distância entre dois pontos): {diameter:.2f} metros, "
+          f"entre {diameter_endpoints[0]} e {diameter_endpoints[1]} ({searches} buscas)")
+    diameter_path = nx.shortest_path(subgraph, *diameter_endpoints, weight='length')
+    fig, ax = ox.plot_graph_route(subgraph, diameter_path, route_color='orange', node_size=0, show=True)
 except nx.NetworkXError:
     print("O grafo não é conexo, não foi possível calcular o diâmetro.")
 
 # Identificar os pontos mais próximos com base na distância mais curta
+# (o par mais próximo é ligado por uma aresta; ver nearest_pairs.py)
 print("Calculando os pontos mais próximos...")
 min_path_length = float('inf')
 min_path = None
-for node1 in subgraph:
-    for node2 in subgraph:
-        if node1 != node2:
-            try:
-                length = nx.shortest_path_length(subgraph, node1, node2, weight='length')
-                if length < min_path_length:
-                    min_path_length = length
-                    min_path = (node1, node2)
-            except nx.NetworkXNoPath:
-                pass
+closest_pairs = closest_pairs_network(subgraph, k=5)
+if closest_pairs:
+    min_path_length, *min_path = closest_pairs[0]
+    min_path = tuple(min_path)
+    print("Os 5 pares mais próximos pela rede:")
+    for length, node1, node2 in closest_pairs:
+        print(f"  {node1} - {node2}: {length:.2f} metros")
+    print("Os 5 pares mais próximos em linha reta:")
+    for length, node1, node2 in closest_pairs_euclidean(subgraph, k=5):
+        print(f"  {node1} - {node2}: {length:.2f} metros")
 
 if min_path:
     print(f"Pontos mais próximos: {min_path} com uma distância de {min_path_length} metros")
@@ -100,8 +124,8 @@ else:
 
 # === Exibir as principais métricas calculadas ===
 print("\n===== Principais Métricas Calculadas =====")
-print(f"1. Número de Ciclos: {len(cycles)}")
-print(f"2. Diâmetro da Rede (distância mais longa): {diameter if 'diameter' in locals() else 'Não disponível'}")
+print(f"1. Número de Ciclos: {num_cycles}")
+print(f"2. Diâmetro da Rede (distância mais longa): {f'{diameter:.2f} metros' if 'diameter' in locals() else 'Não disponível'}")
 print(f"3. Distância mínima entre dois pontos: {min_path_length if min_path else 'Não disponível'}")
 print(f"4. Número de Pontos de Cruzamento: {len(crossing_points)}")
 print("==========================================")
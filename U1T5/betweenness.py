@@ -0,0 +1,71 @@
+"""
+Betweenness centrality (Brandes, sem pesos) exata ou aproximada por amostragem
+de pivôs, com as origens distribuídas por um pool de processos.
+
+Com k pivôs sorteados sem reposição, a soma das contribuições de cada origem
+multiplicada por n/k é um estimador não-viesado da betweenness exata (como
+nx.betweenness_centrality(G, k=...)). Cada processo acumula, para o seu lote
+de origens, a soma e a soma dos quadrados das contribuições por nó; os lotes
+são somados no final (a BFS, a acumulação de Brandes e o pool são os de
+accumulate_sources e sweep, em centrality.py na raiz do repositório).
+Disso saem dois limites de erro:
+- half_width: meia-largura do intervalo de confiança (normal) de cada nó,
+  com a correção de população finita (zero quando k = n). É aproximado: as
+  contribuições são muito assimétricas, então vale bem para os nós de maior
+  centralidade (os que entram no ranking) e pouco para os de valor quase nulo;
+- bound: limite uniforme de Hoeffding para todos os nós ao mesmo tempo,
+  |estimativa - exata| <= bound com probabilidade >= confidence.
+"""
+import os
+import random
+import sys
+from math import log, sqrt
+from statistics import NormalDist
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from centrality import betweenness_scale, index_adjacency, sweep
+
+
+# ==== Função para a betweenness exata ou amostrada ====
+def sampled_betweenness(graph, k=None, normalized=True, endpoints=True, seed=None,
+                        workers=None, confidence=0.95):
+    """
+    Betweenness centrality sem pesos a partir de k origens sorteadas (todas,
+    e portanto exata, se k for None ou >= n), com os mesmos parâmetros de
+    nx.betweenness_centrality. Com workers > 1 os lotes de origens vão para
+    um pool de processos; a adjacência é enviada uma vez a cada processo.
+    Retorna (centralidade, half_width, bound): dicionários {nó: valor} com a
+    estimativa e a meia-largura do intervalo de confiança de cada nó, e o
+    limite uniforme de erro para todos os nós.
+    """
+    nodes, adjacency = index_adjacency(graph)
+    n = len(nodes)
+    if n == 0:
+        return {}, {}, 0.0
+    if k is None or k >= n:
+        sources = list(range(n))
+    else:
+        sources = random.Random(seed).sample(range(n), k)
+    k = len(sources)
+    totals = sweep(adjacency, sources, workers, betweenness=True, endpoints=endpoints, squares=True)
+    total, total_sq = totals["betweenness_sum"], totals["betweenness_sq"]
+
+    # Cada pivô dá uma amostra Y(v) = factor * contribuição(v); a estimativa é a média
+    factor = betweenness_scale(n, normalized, graph.is_directed(), endpoints) * n
+    estimate = total * (factor / k)
+
+    if k == n:
+        half_width = np.zeros(n)
+        bound = 0.0
+    else:
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        variance = np.maximum(total_sq - total * total / k, 0) / max(k - 1, 1)
+        finite_population = sqrt((n - k) / (n - 1))
+        half_width = z * factor * np.sqrt(variance / k) * finite_population
+        # Cada contribuição fica em [0, n - 1]; Hoeffding com união sobre os n nós
+        bound = factor * (n - 1) * sqrt(log(2 * n / (1 - confidence)) / (2 * k))
+
+    centrality = dict(zip(nodes, estimate.tolist()))
+    return centrality, dict(zip(nodes, half_width.tolist())), bound
@@ -1,7 +1,12 @@
+import os
+import sys
 import networkx as nx
 import matplotlib.pyplot as plt
 import community as community_louvain
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from centrality import centrality_dicts, centrality_table
+
 # Função para carregar a base de dados em formato GEXF
 def load_graph(filepath):
     return nx.read_gexf(filepath)
@@ -39,8 +44,10 @@ graph.remove_edges_from(nx.selfloop_edges(graph))
 
 # Calcular métricas básicas
 degree = dict(graph.degree())
-closeness = nx.closeness_centrality(graph)
-betweenness = nx.betweenness_centrality(graph)
+# Closeness e Betweenness Centrality com uma única busca por origem (ver centrality.py)
+centrality = centrality_dicts(*centrality_table(graph))
+closeness = centrality["closeness_centrality"]
+betweenness = centrality["betweenness_centrality"]
 eigenvector = nx.eigenvector_centrality(graph)
 
 # Layout padrão para todas as visualizações (Ajuste de semente para layout consistente)
@@ -1,7 +1,11 @@
 import numpy as np
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from scipy.stats import t
 import matplotlib.pyplot as plt
+from itertools import islice
+from bst_array import ArrayBST, balanced_layout, closest_snapshot
 
 # Classes e funções auxiliares para BST
 class Node:
@@ -9,18 +13,115 @@ class Node:
         self.value = value
         self.left_child = None
         self.right_child = None
+        self.height = 1
+        self.size = 1  # número de nós na subárvore (estatística de ordem)
 
-class BST:
+# Contadores opcionais de nós visitados por operação
+class BSTStats:
     def __init__(self):
+        self.calls = {}
+        self.visits = {}
+        self.max_visits = {}
+
+    def record(self, operation, visited):
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        self.visits[operation] = self.visits.get(operation, 0) + visited
+        self.max_visits[operation] = max(self.max_visits.get(operation, 0), visited)
+
+    def as_dict(self):
+        return {operation: {"calls": calls,
+                            "visits": self.visits[operation],
+                            "avg_visits": self.visits[operation] / calls,
+                            "max_visits": self.max_visits[operation]}
+                for operation, calls in self.calls.items()}
+
+class BST:
+    def __init__(self, balanced=False, instrument=False):
+        # balanced=True ativa o modo AVL, que garante altura O(log n)
         self.root = None
+        self.balanced = balanced
+        self._snapshot = None  # cache de solver_closest_batch, invalidado a cada alteração
+        self.stats = None
+        if instrument:
+            self.enable_stats()
+
+    def __len__(self):
+        return self._size(self.root)
+
+    @classmethod
+    def from_sorted(cls, arr, balanced=False):
+        """
+        Constrói uma árvore perfeitamente balanceada a partir de um vetor já
+        ordenado, de baixo para cima e sem comparações entre elementos. Os
+        filhos, tamanhos e alturas vêm de balanced_layout (vetorizado); o
+        resultado também é uma AVL válida, por isso aceita balanced=True.
+        """
+        arr = np.asarray(arr)
+        tree = cls(balanced=balanced)
+        root, left, right, size = balanced_layout(len(arr))
+        if root < 0:
+            return tree
+
+        nodes = [Node(value) for value in arr]
+        heights = np.floor(np.log2(size)).astype(np.int64) + 1
+        for node, l, r, s, h in zip(nodes, left.tolist(), right.tolist(), size.tolist(), heights.tolist()):
+            if l >= 0:
+                node.left_child = nodes[l]
+            if r >= 0:
+                node.right_child = nodes[r]
+            node.size = s
+            node.height = h
+        tree.root = nodes[root]
+        return tree
+
+    @classmethod
+    def from_array(cls, arr, balanced=False):
+        """Ordena arr uma única vez (np.sort) e chama from_sorted."""
+        return cls.from_sorted(np.sort(np.asarray(arr)), balanced=balanced)
+
+    def to_array_bst(self):
+        """Copia a árvore, com o mesmo formato, para uma ArrayBST (nós em ordem de nível)."""
+        nodes = [self.root] if self.root is not None else []
+        for node in nodes:
+            nodes.extend(child for child in (node.left_child, node.right_child) if child is not None)
+        index = {id(node): i for i, node in enumerate(nodes)}
+
+        values = np.asarray([node.value for node in nodes])
+        typecode = 'q' if np.issubdtype(values.dtype, np.integer) else 'd'
+        tree = ArrayBST(capacity=len(nodes), typecode=typecode)
+        for i, node in enumerate(nodes):
+            tree._values[i] = node.value
+            if node.left_child is not None:
+                tree._left[i] = index[id(node.left_child)]
+            if node.right_child is not None:
+                tree._right[i] = index[id(node.right_child)]
+        tree._count = len(nodes)
+        tree.root = 0 if nodes else -1
+        return tree
+
+    def save(self, path):
+        """Grava a árvore em disco no formato binário plano da ArrayBST."""
+        self.to_array_bst().save(path)
+
+    @staticmethod
+    def load(path, mmap=True):
+        """
+        Carrega uma árvore gravada por save como ArrayBST, mapeada em memória
+        com numpy.memmap quando mmap=True. Os solvers aceitam o resultado.
+        """
+        return ArrayBST.load(path, mmap=mmap)
 
     def add(self, value):
-        if self.root is None:
+        self._snapshot = None
+        if self.balanced:
+            self._add_balanced(value)
+        elif self.root is None:
             self.root = Node(value)
         else:
             self._add_recursive(self.root, value)
 
     def _add_recursive(self, current_node, value):
+        current_node.size += 1
         if value <= current_node.value:
             if current_node.left_child is None:
                 current_node.left_child = Node(value)
@@ -32,8 +133,359 @@ class BST:
             else:
                 self._add_recursive(current_node.right_child, value)
 
+    # Inserção AVL iterativa: desce guardando o caminho e rebalanceia na volta
+    def _add_balanced(self, value):
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            node = node.left_child if value <= node.value else node.right_child
+
+        new_node = Node(value)
+        if not path:
+            self.root = new_node
+            return
+        if value <= path[-1].value:
+            path[-1].left_child = new_node
+        else:
+            path[-1].right_child = new_node
+        self._retrace(path, 1)
+
+    def remove(self, value):
+        """
+        Remove uma ocorrência de value, atualizando os tamanhos das subárvores
+        (e rebalanceando no modo AVL). Lança ValueError se value não existir.
+        """
+        self._snapshot = None
+        path = []
+        node = self.root
+        while node is not None and node.value != value:
+            path.append(node)
+            node = node.left_child if value < node.value else node.right_child
+        if node is None:
+            raise ValueError(f"{value} não está na árvore.")
+
+        # Com dois filhos, copia o sucessor e passa a remover o nó dele
+        if node.left_child is not None and node.right_child is not None:
+            path.append(node)
+            successor = node.right_child
+            while successor.left_child is not None:
+                path.append(successor)
+                successor = successor.left_child
+            node.value = successor.value
+            node = successor
+
+        child = node.left_child if node.left_child is not None else node.right_child
+        if not path:
+            self.root = child
+            return
+        parent = path[-1]
+        if parent.left_child is node:
+            parent.left_child = child
+        else:
+            parent.right_child = child
+        self._retrace(path, -1)
+
+    # Atualiza o caminho de baixo para cima após inserir (delta=1) ou remover (delta=-1)
+    def _retrace(self, path, delta):
+        if not self.balanced:
+            for node in path:
+                node.size += delta
+            return
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            subtree = self._rebalance(node)
+            if subtree is node:
+                continue
+            if i == 0:
+                self.root = subtree
+            elif path[i - 1].left_child is node:
+                path[i - 1].left_child = subtree
+            else:
+                path[i - 1].right_child = subtree
+
+    # Estatísticas de ordem: uma única descida a partir da raiz, O(altura)
+    def kth_smallest(self, k):
+        if k < 1 or k > len(self):
+            raise IndexError("k fora do intervalo da árvore.")
+        node = self.root
+        while True:
+            left_size = self._size(node.left_child)
+            if k <= left_size:
+                node = node.left_child
+            elif k == left_size + 1:
+                return node.value
+            else:
+                k -= left_size + 1
+                node = node.right_child
+
+    def kth_largest(self, k):
+        if k < 1 or k > len(self):
+            raise IndexError("k fora do intervalo da árvore.")
+        return self.kth_smallest(len(self) - k + 1)
+
+    def rank(self, value):
+        """Quantidade de valores da árvore estritamente menores que value."""
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.value < value:
+                count += self._size(node.left_child) + 1
+                node = node.right_child
+            else:
+                node = node.left_child
+        return count
+
+    @staticmethod
+    def _size(node):
+        return node.size if node is not None else 0
+
+    # Iteradores preguiçosos com pilha explícita: O(altura + itens consumidos)
+    def iter_ascending(self):
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left_child
+            node = stack.pop()
+            yield node.value
+            node = node.right_child
+
+    def iter_descending(self):
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.right_child
+            node = stack.pop()
+            yield node.value
+            node = node.left_child
+
+    def range(self, lo, hi):
+        """Valores v com lo <= v <= hi, em ordem crescente, sem visitar subárvores fora do intervalo."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                if node.value < lo:
+                    node = node.right_child
+                else:
+                    stack.append(node)
+                    node = node.left_child
+            if not stack:
+                return
+            node = stack.pop()
+            if node.value > hi:
+                return
+            yield node.value
+            node = node.right_child
+
+    def top_k(self, k):
+        """Os k maiores valores, do maior para o menor."""
+        return list(islice(self.iter_descending(), k))
+
+    def sorted_snapshot(self):
+        """
+        Valores distintos em ordem crescente e a menor profundidade de cada um
+        (ver closest_snapshot), obtidos por um percurso em ordem iterativo.
+        O resultado fica em cache até a próxima inserção ou remoção.
+        """
+        if self._snapshot is None:
+            values = []
+            depths = []
+            stack = []
+            node, depth = self.root, 0
+            while stack or node is not None:
+                while node is not None:
+                    stack.append((node, depth))
+                    node, depth = node.left_child, depth + 1
+                node, depth = stack.pop()
+                values.append(node.value)
+                depths.append(depth)
+                node, depth = node.right_child, depth + 1
+            self._snapshot = closest_snapshot(values, depths)
+        return self._snapshot
+
+    # Instrumentação opcional. Desligada (padrão), nenhum caminho quente muda:
+    # add é o método da classe e os solvers só consultam tree.stats uma vez.
+    # Ligada, os nós visitados são contados por uma descida extra, fora do
+    # código medido pelos experimentos.
+    def enable_stats(self):
+        self.stats = BSTStats()
+        self.add = self._add_instrumented
+
+    def disable_stats(self):
+        self.stats = None
+        self.__dict__.pop("add", None)
+
+    def _add_instrumented(self, value):
+        self.stats.record("add", self.insert_path_length(value))
+        BST.add(self, value)
+
+    def insert_path_length(self, value):
+        """Nós visitados pela inserção de value (profundidade do novo nó)."""
+        visited = 0
+        node = self.root
+        while node is not None:
+            visited += 1
+            node = node.left_child if value <= node.value else node.right_child
+        return visited
+
+    def closest_path_length(self, target):
+        """Nós visitados por solver_closest(self, target)."""
+        visited = 0
+        node = self.root
+        while node is not None:
+            visited += 1
+            if target < node.value:
+                node = node.left_child
+            elif target > node.value:
+                node = node.right_child
+            else:
+                break
+        return visited
+
+    def descending_visits(self, k):
+        """Nós empilhados pelo percurso reverso até o k-ésimo maior valor."""
+        visited = 0
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                visited += 1
+                stack.append(node)
+                node = node.right_child
+            node = stack.pop()
+            k -= 1
+            if k == 0:
+                break
+            node = node.left_child
+        return visited
+
+    def depth_histogram(self):
+        """histogram[d] = quantidade de nós na profundidade d (raiz = 0)."""
+        histogram = []
+        level = [self.root] if self.root is not None else []
+        while level:
+            histogram.append(len(level))
+            level = [child for node in level for child in (node.left_child, node.right_child)
+                     if child is not None]
+        return histogram
+
+    def height(self):
+        """Altura atual: O(1) no modo AVL, um percurso por níveis caso contrário."""
+        if self.balanced:
+            return self._height(self.root)
+        return len(self.depth_histogram())
+
+    def instrumentation_report(self):
+        report = {"height": self.height(), "depth_histogram": self.depth_histogram()}
+        if self.stats is not None:
+            report["operations"] = self.stats.as_dict()
+        return report
+
+    @staticmethod
+    def _height(node):
+        return node.height if node is not None else 0
+
+    def _update(self, node):
+        node.height = 1 + max(self._height(node.left_child), self._height(node.right_child))
+        node.size = 1 + self._size(node.left_child) + self._size(node.right_child)
+
+    def _rotate_left(self, node):
+        pivot = node.right_child
+        node.right_child = pivot.left_child
+        pivot.left_child = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        pivot = node.left_child
+        node.left_child = pivot.right_child
+        pivot.right_child = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        self._update(node)
+        balance = self._height(node.left_child) - self._height(node.right_child)
+        if balance > 1:
+            left = node.left_child
+            if self._height(left.left_child) < self._height(left.right_child):
+                node.left_child = self._rotate_left(left)
+            return self._rotate_right(node)
+        if balance < -1:
+            right = node.right_child
+            if self._height(right.right_child) < self._height(right.left_child):
+                node.right_child = self._rotate_right(right)
+            return self._rotate_left(node)
+        return node
+
+# Função para gerar vetores de entrada
+def generate_input(size, distribution="random"):
+    """
+    Gera um vetor de entrada com a distribuição pedida, usando o gerador
+    global do NumPy (reprodutível com np.random.seed):
+    - "random": inteiros uniformes em [0, 10^6)
+    - "sorted": os mesmos valores em ordem crescente (caso adversarial)
+    - "reverse": os mesmos valores em ordem decrescente (caso adversarial)
+    - "duplicates": poucos valores distintos, com muitas repetições
+    """
+    if distribution == "duplicates":
+        return np.random.randint(0, 10, size=size)
+    arr = np.random.randint(0, 1000000, size=size)
+    if distribution == "sorted":
+        return np.sort(arr)
+    if distribution == "reverse":
+        return np.sort(arr)[::-1]
+    if distribution != "random":
+        raise ValueError(f"Distribuição desconhecida: {distribution}")
+    return arr
+
+# Função para construir a árvore a partir de um vetor
+def build_tree(arr, tree_class=None, balanced=False, bulk=False, instrument=False):
+    """
+    Constrói uma árvore inserindo os valores de arr em ordem. tree_class pode
+    ser BST (padrão, um Node por valor) ou ArrayBST (vetores compactos);
+    balanced=True constrói um BST no modo AVL. bulk=True usa a carga em
+    bloco (from_array), que ordena uma vez e monta a árvore balanceada.
+    instrument=True liga os contadores de BSTStats (apenas no BST).
+    O modo AVL só existe no BST: com ArrayBST, balanced=True exige bulk=True
+    (a carga em bloco já monta a árvore perfeitamente balanceada).
+    """
+    tree_class = tree_class or BST
+    if balanced and not issubclass(tree_class, BST):
+        if not bulk:
+            raise ValueError(f"{tree_class.__name__} não tem modo AVL (balanced=True); "
+                             "use o BST ou a carga em bloco (bulk=True).")
+        balanced = False
+    if bulk:
+        tree = tree_class.from_array(arr, balanced=True) if balanced else tree_class.from_array(arr)
+        if instrument and isinstance(tree, BST):
+            tree.enable_stats()
+        return tree
+    tree = tree_class(balanced=True) if balanced else tree_class()
+    if instrument and isinstance(tree, BST):
+        tree.enable_stats()
+    if isinstance(tree, ArrayBST):
+        tree.extend(arr)
+    else:
+        for value in arr:
+            tree.add(value)
+    return tree
+
 # Função solver_closest
 def solver_closest(tree, target):
+    stats = getattr(tree, "stats", None)
+    if stats is not None:
+        stats.record("solver_closest", tree.closest_path_length(target))
+    if isinstance(tree, ArrayBST):
+        return tree.closest(target)
+
     def findClosestValueInBstHelper(node, target, closest):
         if node is None:
             return closest
@@ -48,82 +500,145 @@ def solver_closest(tree, target):
 
     return findClosestValueInBstHelper(tree.root, target, tree.root.value)
 
-# Função solver_kth_largest
-def solver_kth_largest(tree, k):
-    sortedNodeValues = []
+# Função solver_closest para muitos alvos de uma vez
+def solver_closest_batch(tree, targets):
+    """
+    Responde solver_closest para um vetor inteiro de alvos com busca binária
+    vetorizada (np.searchsorted) sobre o retrato ordenado da árvore. O
+    resultado é idêntico a chamar solver_closest alvo a alvo, inclusive nos
+    empates, que são decididos pela profundidade dos nós.
+    """
+    values, depths = tree.sorted_snapshot()
+    if not len(values):
+        raise ValueError("A árvore está vazia.")
+    targets = np.asarray(targets)
 
-    def inOrderTraverse(node):
-        if node is None:
-            return
-        inOrderTraverse(node.left_child)
-        sortedNodeValues.append(node.value)
-        inOrderTraverse(node.right_child)
+    # Buscar os alvos em ordem crescente torna o acesso à memória sequencial
+    flat = targets.ravel()
+    order = np.argsort(flat, kind="stable")
+    pos = np.empty(flat.shape, dtype=np.intp)
+    pos[order] = np.searchsorted(values, flat[order], side="left")
+    pos = pos.reshape(targets.shape)
+    succ_idx = np.minimum(pos, len(values) - 1)
+    pred_idx = np.maximum(pos - 1, 0)
+    succ = values[succ_idx]
+    pred = values[pred_idx]
 
-    inOrderTraverse(tree.root)
-    return sortedNodeValues[-k]
+    dist_pred = np.abs(targets - pred)
+    dist_succ = np.abs(targets - succ)
+    take_pred = (dist_pred < dist_succ) | ((dist_pred == dist_succ) & (depths[pred_idx] < depths[succ_idx]))
+    return np.where(take_pred, pred, succ)
+
+# Função solver_kth_largest
+def solver_kth_largest(tree, k):
+    # Percurso em ordem reversa que para no k-ésimo nó: O(altura + k)
+    if k < 1:
+        raise IndexError("k deve ser positivo.")
+    stats = getattr(tree, "stats", None)
+    if stats is not None:
+        stats.record("solver_kth_largest", tree.descending_visits(k))
+    for value in islice(tree.iter_descending(), k - 1, None):
+        return value
+    raise IndexError("k maior que o número de valores da árvore.")
 
 # Função para medir o tempo de execução
 def measure_execution_time(func, *args, **kwargs):
-    start_time = time.time()
+    # perf_counter_ns é monotônico e tem resolução de nanossegundos
+    start_time = time.perf_counter_ns()
     result = func(*args, **kwargs)
-    end_time = time.time()
-    return end_time - start_time, result
-
-# Função para executar experimentos solver_closest
-def run_experiments_closest(max_size=10**6, step=10**5, repetitions=15):
-    np.random.seed(42)
-    sizes = range(step, max_size + 1, step)
-    results = {"sizes": [], "avg_time": [], "conf_interval": []}
-
-    for size in sizes:
-        times = []
-
-        for _ in range(repetitions):
-            arr = np.random.randint(0, 1000000, size=size)
-            bst = BST()
-            for value in arr:
-                bst.add(value)
+    end_time = time.perf_counter_ns()
+    return (end_time - start_time) / 1e9, result
 
-            target = np.random.randint(0, 1000000)
-            time_taken, _ = measure_execution_time(solver_closest, bst, target)
-            times.append(time_taken)
+# Função para calcular a média e a meia largura do IC de 95% (t-Student)
+def summarize_times(times):
+    mean_time = np.mean(times)
+    conf_interval = t.interval(0.95, len(times) - 1, loc=mean_time, scale=np.std(times, ddof=1))
+    return mean_time, conf_interval[1] - mean_time
 
-        mean_time = np.mean(times)
-        conf_interval = t.interval(0.95, len(times) - 1, loc=mean_time, scale=np.std(times, ddof=1))
+# Função para gerar a semente determinística de uma célula (tamanho, repetição)
+def cell_seed(seed, size, repetition):
+    return (seed * 1000003 + size * 101 + repetition) % (2**32)
 
-        results["sizes"].append(size)
-        results["avg_time"].append(mean_time)
-        results["conf_interval"].append((conf_interval[1] - mean_time))
+# Função para executar uma célula (tamanho, repetição) de um experimento
+def run_experiment_cell(experiment, size, repetition, seed=42, tree_class=None,
+                        balanced=False, distribution="random", bulk=False):
+    """
+    Gera a entrada com a semente da célula, constrói a árvore e mede o
+    solver. Como cada célula tem sua própria semente, o resultado não
+    depende da ordem de execução nem do processo que a executa.
+    Retorna {"times": {série: segundos}, "answers": {série: resposta}}.
+    """
+    np.random.seed(cell_seed(seed, size, repetition))
+    arr = generate_input(size, distribution)
+    bst = build_tree(arr, tree_class, balanced, bulk)
 
-    return results
+    if experiment == "closest":
+        target = np.random.randint(0, 1000000)
+        calls = {"": lambda: solver_closest(bst, target)}
+    else:
+        k = size // 2
+        # Custo antigo (percurso em ordem completo) e novo (árvore com tamanhos).
+        # A ArrayBST não guarda tamanhos de subárvore: seu kth_largest é o mesmo
+        # percurso O(altura + k), então a série "_indexed" só existe no BST
+        calls = {"": lambda: solver_kth_largest(bst, k)}
+        if isinstance(bst, BST):
+            calls["_indexed"] = lambda: bst.kth_largest(k)
 
-# Função para executar experimentos solver_kth_largest
-def run_experiments_kth_largest(max_size=10**6, step=10**5, repetitions=15):
-    np.random.seed(42)
-    sizes = range(step, max_size + 1, step)
-    results = {"sizes": [], "avg_time": [], "conf_interval": []}
+    times, answers = {}, {}
+    for suffix, call in calls.items():
+        time_taken, answer = measure_execution_time(call)
+        times[suffix] = time_taken
+        answers[suffix] = answer.item() if hasattr(answer, "item") else answer
+    return {"times": times, "answers": answers}
 
-    for size in sizes:
-        times = []
+# Função para executar um experimento em série ou em paralelo
+def run_experiments(experiment, max_size=10**6, step=10**5, repetitions=15, tree_class=None,
+                    balanced=False, distribution="random", bulk=False, workers=None, seed=42):
+    """
+    Executa as células (tamanho, repetição) do experimento "closest" ou
+    "kth_largest". Com workers > 1 as células são distribuídas em um
+    ProcessPoolExecutor; as sementes por célula garantem as mesmas entradas
+    e respostas da execução em série. Os tempos de cada tamanho são então
+    agregados em média e IC de 95% (t-Student).
+    """
+    sizes = list(range(step, max_size + 1, step))
+    cells = [(size, repetition) for size in sizes for repetition in range(repetitions)]
+    options = dict(seed=seed, tree_class=tree_class, balanced=balanced, distribution=distribution, bulk=bulk)
 
-        for _ in range(repetitions):
-            arr = np.random.randint(0, 1000000, size=size)
-            bst = BST()
-            for value in arr:
-                bst.add(value)
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_experiment_cell, experiment, size, repetition, **options)
+                       for size, repetition in cells]
+            outputs = [future.result() for future in futures]
+    else:
+        outputs = [run_experiment_cell(experiment, size, repetition, **options) for size, repetition in cells]
 
-            k = size // 2
-            time_taken, _ = measure_execution_time(solver_kth_largest, bst, k)
-            times.append(time_taken)
+    suffixes = list(outputs[0]["times"]) if outputs else [""]
+    results = {"sizes": sizes, "answers": []}
+    for suffix in suffixes:
+        results["avg_time" + suffix] = []
+        results["conf_interval" + suffix] = []
 
-        mean_time = np.mean(times)
-        conf_interval = t.interval(0.95, len(times) - 1, loc=mean_time, scale=np.std(times, ddof=1))
+    for i, size in enumerate(sizes):
+        size_outputs = outputs[i * repetitions:(i + 1) * repetitions]
+        results["answers"].append([output["answers"][""] for output in size_outputs])
+        for suffix in suffixes:
+            mean_time, conf_interval = summarize_times([output["times"][suffix] for output in size_outputs])
+            results["avg_time" + suffix].append(mean_time)
+            results["conf_interval" + suffix].append(conf_interval)
+    return results
 
-        results["sizes"].append(size)
-        results["avg_time"].append(mean_time)
-        results["conf_interval"].append((conf_interval[1] - mean_time))
+# Função para executar experimentos solver_closest
+def run_experiments_closest(max_size=10**6, step=10**5, repetitions=15, tree_class=None,
+                          balanced=False, distribution="random", bulk=False, workers=None):
+    return run_experiments("closest", max_size, step, repetitions, tree_class,
+                           balanced, distribution, bulk, workers)
 
-    return results
+# Função para executar experimentos solver_kth_largest
+def run_experiments_kth_largest(max_size=10**6, step=10**5, repetitions=15, tree_class=None,
+                              balanced=False, distribution="random", bulk=False, workers=None):
+    return run_experiments("kth_largest", max_size, step, repetitions, tree_class,
+                           balanced, distribution, bulk, workers)
 
 # Função para gerar gráficos em segundos
 def plot_results(results, title, xlabel="Tamanho do vetor", ylabel="Tempo médio de execução (s)"):
@@ -136,19 +651,55 @@ def plot_results(results, title, xlabel="Tamanho do vetor", ylabel="Tempo médio
     plt.legend()
     plt.show()
 
+# Função para comparar várias séries de resultados no mesmo gráfico
+def plot_comparison(results_by_label, title, xlabel="Tamanho do vetor", ylabel="Tempo médio de execução (s)"):
+    plt.figure(figsize=(12, 6))
+    for label, results in results_by_label.items():
+        plt.errorbar(results["sizes"], results["avg_time"], yerr=results["conf_interval"], fmt='o-', capsize=5, label=label)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.title(title)
+    plt.grid(True)
+    plt.legend()
+    plt.show()
+
 # Função principal
-def main():
+def main(workers=None):
+    # workers > 1 distribui as células dos experimentos entre processos
     max_size = 10**6
     step = 10**5
     repetitions = 10
 
     print("Executando experimentos para Solver Closest...")
-    results_closest = run_experiments_closest(max_size=max_size, step=step, repetitions=repetitions)
+    results_closest = run_experiments_closest(max_size=max_size, step=step, repetitions=repetitions,
+                                              workers=workers)
     plot_results(results_closest, title="Desempenho do Solver Closest")
 
     print("Executando experimentos para Solver Kth Largest...")
-    results_kth_largest = run_experiments_kth_largest(max_size=max_size, step=step, repetitions=repetitions)
+    results_kth_largest = run_experiments_kth_largest(max_size=max_size, step=step, repetitions=repetitions,
+                                                      workers=workers)
     plot_results(results_kth_largest, title="Desempenho do Solver Kth Largest")
+    plot_comparison({
+        "Percurso em ordem (solver_kth_largest)": results_kth_largest,
+        "Árvore com tamanhos (BST.kth_largest)": {
+            "sizes": results_kth_largest["sizes"],
+            "avg_time": results_kth_largest["avg_time_indexed"],
+            "conf_interval": results_kth_largest["conf_interval_indexed"],
+        },
+    }, title="Kth Largest: percurso completo x estatística de ordem")
+
+    # Entradas adversariais: a BST sem balanceamento degrada para altura O(n),
+    # por isso usamos tamanhos menores e a ArrayBST (inserção iterativa)
+    print("Executando experimentos adversariais (entrada ordenada) para Solver Closest...")
+    results_adversarial = {
+        "Sem balanceamento": run_experiments_closest(max_size=5000, step=500, repetitions=5,
+                                                     tree_class=ArrayBST, distribution="sorted",
+                                                     workers=workers),
+        "AVL": run_experiments_closest(max_size=5000, step=500, repetitions=5,
+                                       balanced=True, distribution="sorted", workers=workers),
+    }
+    plot_comparison(results_adversarial, title="Solver Closest com entrada ordenada")
 
 if __name__ == "__main__":
-    main()
+    # Uso: python Codigofonte.py [número de processos]
+    main(workers=int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,338 @@
+"""
+Benchmark dos solvers da BST (U2T2), sem interface gráfica.
+
+Mede separadamente as fases de construção da árvore e de consulta, com
+time.perf_counter_ns, execuções de aquecimento e entradas reprodutíveis
+(uma semente por célula). Varre tamanhos, distribuições de entrada,
+backends e operações, grava os resultados em JSON/CSV e compara com um
+baseline salvo para detectar regressões.
+
+Exemplos:
+    python benchmark.py --sizes 10000 100000 --output atual.json --csv atual.csv
+    python benchmark.py --sizes 10000 100000 --baseline baseline.json --tolerance 0.25
+"""
+import argparse
+import csv
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from Codigofonte import (ArrayBST, build_tree, cell_seed, generate_input, solver_closest,
+                         solver_closest_batch, solver_kth_largest, summarize_times)
+
+# Backends: como construir a árvore a partir do vetor de entrada
+BACKENDS = {
+    "bst": lambda arr, instrument=False: build_tree(arr, instrument=instrument),
+    "bst_avl": lambda arr, instrument=False: build_tree(arr, balanced=True, instrument=instrument),
+    "bst_bulk": lambda arr, instrument=False: build_tree(arr, bulk=True, instrument=instrument),
+    "array": lambda arr, instrument=False: build_tree(arr, ArrayBST),
+    "array_bulk": lambda arr, instrument=False: ArrayBST.from_array(arr),
+}
+
+# Operações: (função de consulta, função que gera os argumentos da consulta)
+BATCH_SIZE = 10000
+OPERATIONS = {
+    "closest": (solver_closest, lambda size: (np.random.randint(0, 1000000),)),
+    "closest_batch": (solver_closest_batch, lambda size: (np.random.randint(0, 1000000, size=BATCH_SIZE),)),
+    "kth_largest": (solver_kth_largest, lambda size: (size // 2,)),
+    "kth_largest_indexed": (lambda tree, k: tree.kth_largest(k), lambda size: (size // 2,)),
+}
+
+# A ArrayBST sem balanceamento não estoura a pilha (inserção iterativa), mas
+# degenera para altura O(n) e construção O(n²) nessas distribuições; acima de
+# DEGENERATE_MAX_SIZE a célula é ignorada, como a do BST recursivo
+DEGENERATE_BACKENDS = {"array"}
+DEGENERATE_DISTRIBUTIONS = {"sorted", "reverse", "duplicates"}
+DEGENERATE_MAX_SIZE = 5000
+
+# Backends sem tamanhos de subárvore: neles kth_largest_indexed é o mesmo
+# percurso O(altura + k) e a série é rotulada kth_largest_walk
+WALK_BACKENDS = {"array", "array_bulk"}
+WALK_LABELS = {"kth_largest_indexed": "kth_largest_walk"}
+
+# Nome de cada operação nos contadores de BSTStats
+STATS_NAMES = {"closest": "solver_closest", "kth_largest": "solver_kth_largest"}
+
+# Campos que identificam uma linha de resultado
+KEY_FIELDS = ("backend", "operation", "distribution", "size")
+
+
+# Função para medir uma chamada em nanossegundos
+def time_ns(func, *args):
+    start = time.perf_counter_ns()
+    result = func(*args)
+    return time.perf_counter_ns() - start, result
+
+
+# Função para o nome da série de uma operação em um backend
+def operation_label(backend, operation):
+    if backend in WALK_BACKENDS:
+        return WALK_LABELS.get(operation, operation)
+    return operation
+
+
+# Função para medir um backend em uma distribuição e tamanho
+def run_cell(backend, distribution, size, operations=None, repetitions=5, queries=5, warmup=1, seed=42,
+             instrument=False):
+    """
+    Executa warmup repetições descartadas e depois repetitions repetições
+    medidas. Em cada repetição a entrada é gerada fora da medição, a
+    construção é medida uma vez e cada operação é medida queries vezes
+    sobre a mesma árvore (após uma chamada de aquecimento).
+    Retorna uma linha por operação, com média, mediana e IC de 95% em ns.
+
+    Com instrument=True, uma passada extra e não medida repete a primeira
+    repetição com os contadores de BSTStats ligados e acrescenta às linhas
+    os nós visitados, a altura e o histograma de profundidades.
+    """
+    operations = operations or list(OPERATIONS)
+    build = BACKENDS[backend]
+    labels = {operation: operation_label(backend, operation) for operation in operations}
+    rows = [{"backend": backend, "operation": labels[operation], "distribution": distribution,
+             "size": size, "repetitions": repetitions, "queries": queries}
+            for operation in operations]
+
+    if (backend in DEGENERATE_BACKENDS and distribution in DEGENERATE_DISTRIBUTIONS
+            and size > DEGENERATE_MAX_SIZE):
+        for row in rows:
+            row["error"] = f"ignorado: construção O(n²) acima de {DEGENERATE_MAX_SIZE}"
+        return rows
+
+    build_times = []
+    query_times = {labels[operation]: [] for operation in operations}
+    try:
+        for repetition in range(-warmup, repetitions):
+            np.random.seed(cell_seed(seed, size, repetition))
+            arr = generate_input(size, distribution)
+            build_ns, tree = time_ns(build, arr)
+            if repetition >= 0:
+                build_times.append(build_ns)
+
+            for operation in operations:
+                query, make_args = OPERATIONS[operation]
+                args = make_args(size)
+                query(tree, *args)
+                times = [time_ns(query, tree, *args)[0] for _ in range(queries)]
+                if repetition >= 0:
+                    query_times[labels[operation]].extend(times)
+    except RecursionError:
+        # A BST sem balanceamento estoura a pilha em entradas ordenadas grandes
+        for row in rows:
+            row["error"] = "RecursionError"
+        return rows
+
+    for row in rows:
+        for phase, times in (("build", build_times), ("query", query_times[row["operation"]])):
+            mean, conf_interval = summarize_times(times) if len(times) > 1 else (float(np.mean(times)), 0.0)
+            row[f"{phase}_ns_mean"] = float(mean)
+            row[f"{phase}_ns_ci"] = float(conf_interval)
+            row[f"{phase}_ns_median"] = float(np.median(times))
+    if instrument:
+        add_instrumentation(rows, backend, distribution, size, seed)
+    return rows
+
+
+# Função para acrescentar os contadores de nós visitados às linhas de uma célula
+def add_instrumentation(rows, backend, distribution, size, seed=42):
+    np.random.seed(cell_seed(seed, size, 0))
+    arr = generate_input(size, distribution)
+    tree = BACKENDS[backend](arr, instrument=True)
+    if getattr(tree, "stats", None) is None:
+        return
+    for row in rows:
+        query, make_args = OPERATIONS[row["operation"]]
+        query(tree, *make_args(size))
+
+    report = tree.instrumentation_report()
+    operations = report.get("operations", {})
+    for row in rows:
+        row["height"] = report["height"]
+        row["depth_histogram"] = report["depth_histogram"]
+        if "add" in operations:
+            row["add_avg_visits"] = operations["add"]["avg_visits"]
+        stats_name = STATS_NAMES.get(row["operation"])
+        if stats_name in operations:
+            row["query_visits"] = operations[stats_name]["max_visits"]
+
+
+# Função para varrer todas as combinações
+def run_benchmark(sizes, distributions=("random",), backends=None, operations=None,
+                  repetitions=5, queries=5, warmup=1, seed=42, instrument=False, verbose=True):
+    backends = backends or list(BACKENDS)
+    rows = []
+    for size in sizes:
+        for distribution in distributions:
+            for backend in backends:
+                cell_rows = run_cell(backend, distribution, size, operations, repetitions=repetitions,
+                                     queries=queries, warmup=warmup, seed=seed, instrument=instrument)
+                rows.extend(cell_rows)
+                if verbose:
+                    for row in cell_rows:
+                        print(format_row(row))
+    return rows
+
+
+# Função para formatar uma linha de resultado
+def format_row(row):
+    label = f"{row['backend']:>11} {row['operation']:>19} {row['distribution']:>10} {row['size']:>9}"
+    if "error" in row:
+        return f"{label}  erro: {row['error']}"
+    text = (f"{label}  build {row['build_ns_mean'] / 1e6:10.3f} ms ± {row['build_ns_ci'] / 1e6:.3f}"
+            f"  query {row['query_ns_mean'] / 1e3:10.3f} µs ± {row['query_ns_ci'] / 1e3:.3f}")
+    if "query_visits" in row:
+        text += f"  visitas {row['query_visits']:>8}"
+    if "height" in row:
+        text += f"  altura {row['height']:>6}"
+    return text
+
+
+# Função para plotar tempo e nós visitados por operação, lado a lado
+def plot_benchmark(rows, path):
+    """
+    Salva em path uma figura com uma linha por operação: à esquerda o tempo
+    médio de consulta por tamanho, à direita os nós visitados (quando a
+    execução foi instrumentada). Usa o backend Agg, sem janela.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    rows = [row for row in rows if "error" not in row]
+    operations = list(dict.fromkeys(row["operation"] for row in rows))
+    fig, axes = plt.subplots(len(operations), 2, figsize=(14, 4 * len(operations)), squeeze=False)
+    for (ax_time, ax_visits), operation in zip(axes, operations):
+        series = {}
+        for row in rows:
+            if row["operation"] == operation:
+                series.setdefault((row["backend"], row["distribution"]), []).append(row)
+        for (backend, distribution), points in series.items():
+            points.sort(key=lambda row: row["size"])
+            label = f"{backend} ({distribution})"
+            sizes = [row["size"] for row in points]
+            ax_time.errorbar(sizes, [row["query_ns_mean"] / 1e3 for row in points],
+                             yerr=[row["query_ns_ci"] / 1e3 for row in points], fmt='o-', capsize=3, label=label)
+            if all("query_visits" in row for row in points):
+                ax_visits.plot(sizes, [row["query_visits"] for row in points], 'o-', label=label)
+        ax_time.set_title(f"{operation}: tempo por consulta")
+        ax_time.set_ylabel("µs")
+        ax_visits.set_title(f"{operation}: nós visitados por consulta")
+        for ax in (ax_time, ax_visits):
+            ax.set_xlabel("Tamanho do vetor")
+            ax.grid(True)
+            if ax.has_data():
+                ax.legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+# Função para salvar os resultados em JSON (com metadados do ambiente)
+def save_json(rows, path, params=None):
+    document = {
+        "metadata": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "params": params or {},
+        },
+        "results": rows,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+
+# Função para salvar os resultados em CSV
+def save_csv(rows, path):
+    fields = []
+    for row in rows:
+        fields.extend(field for field in row if field not in fields)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# Função para carregar resultados salvos por save_json
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+# Função para comparar com um baseline
+def compare_with_baseline(rows, baseline_rows, tolerance=0.2):
+    """
+    Compara as medianas de construção e de consulta com as do baseline
+    (a mediana é menos sensível a ruído da máquina que a média).
+    Retorna a lista de regressões: linhas em que o tempo atual passou de
+    (1 + tolerance) vezes o tempo do baseline, ou que passaram a falhar.
+    """
+    baseline = {tuple(row[field] for field in KEY_FIELDS): row for row in baseline_rows}
+    regressions = []
+    for row in rows:
+        old = baseline.get(tuple(row[field] for field in KEY_FIELDS))
+        if old is None:
+            continue
+        if "error" in row and "error" not in old:
+            regressions.append({**{f: row[f] for f in KEY_FIELDS}, "phase": "all", "error": row["error"]})
+            continue
+        if "error" in row or "error" in old:
+            continue
+        for phase in ("build", "query"):
+            before, after = old[f"{phase}_ns_median"], row[f"{phase}_ns_median"]
+            if after > before * (1 + tolerance):
+                regressions.append({**{f: row[f] for f in KEY_FIELDS}, "phase": phase,
+                                    "baseline_ns": before, "current_ns": after, "ratio": after / before})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos solvers da BST (U2T2).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**4, 10**5])
+    parser.add_argument("--distributions", nargs="+", default=["random"],
+                        choices=["random", "sorted", "reverse", "duplicates"])
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS))
+    parser.add_argument("--operations", nargs="+", choices=list(OPERATIONS))
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="arquivo JSON de saída")
+    parser.add_argument("--csv", help="arquivo CSV de saída")
+    parser.add_argument("--instrument", action="store_true",
+                        help="acrescenta nós visitados, altura e histograma de profundidades")
+    parser.add_argument("--plot", help="arquivo de imagem com tempo e nós visitados por operação")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="aumento relativo aceito antes de acusar regressão (padrão: 0.2)")
+    args = parser.parse_args(argv)
+
+    params = {name: value for name, value in vars(args).items()
+              if name not in ("output", "csv", "plot", "baseline")}
+    rows = run_benchmark(args.sizes, args.distributions, args.backends, args.operations,
+                         repetitions=args.repetitions, queries=args.queries,
+                         warmup=args.warmup, seed=args.seed, instrument=args.instrument)
+    if args.output:
+        save_json(rows, args.output, params)
+    if args.csv:
+        save_csv(rows, args.csv)
+    if args.plot:
+        plot_benchmark(rows, args.plot)
+
+    if args.baseline:
+        regressions = compare_with_baseline(rows, load_results(args.baseline), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regressão(ões) em relação ao baseline:")
+            for regression in regressions:
+                print("  ", regression)
+            return 1
+        print("\nNenhuma regressão em relação ao baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+import struct
+from array import array
+from itertools import islice
+
+import numpy as np
+
+# Índice usado para indicar ausência de filho
+NIL = -1
+
+# Formato em disco: cabeçalho de 32 bytes (assinatura, quantidade de nós, raiz,
+# typecode dos valores) seguido dos vetores values, left e right, contíguos e
+# na ordem de bytes little-endian
+FILE_MAGIC = b"BSTFLAT1"
+FILE_HEADER = struct.Struct("<8sqqc7x")
+
+
+# Função para calcular o formato de uma árvore perfeitamente balanceada
+def balanced_layout(n):
+    """
+    Calcula, sem comparar elementos, a árvore perfeitamente balanceada sobre
+    as posições 0..n-1 de um vetor ordenado: o nó de cada intervalo é o seu
+    ponto médio. Processa um nível inteiro por iteração com operações
+    vetorizadas do NumPy (O(log n) iterações).
+
+    Retorna (root, left, right, size), com left/right em int32 (NIL quando
+    não há filho) e size com o tamanho da subárvore de cada posição.
+    """
+    left = np.full(n, NIL, dtype=np.int32)
+    right = np.full(n, NIL, dtype=np.int32)
+    size = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return NIL, left, right, size
+
+    lo = np.array([0], dtype=np.int64)
+    hi = np.array([n - 1], dtype=np.int64)
+    root = (n - 1) // 2
+    while lo.size:
+        mid = (lo + hi) // 2
+        size[mid] = hi - lo + 1
+
+        has_left = lo < mid
+        has_right = mid < hi
+        left[mid[has_left]] = (lo[has_left] + mid[has_left] - 1) // 2
+        right[mid[has_right]] = (mid[has_right] + 1 + hi[has_right]) // 2
+
+        lo, hi = (np.concatenate((lo[has_left], mid[has_right] + 1)),
+                  np.concatenate((mid[has_left] - 1, hi[has_right])))
+    return root, left, right, size
+
+
+# Função para resumir um percurso em ordem para consultas vetorizadas
+def closest_snapshot(values, depths):
+    """
+    Recebe os valores de uma árvore em ordem crescente e a profundidade de
+    cada nó, e devolve (valores distintos, menor profundidade de cada um).
+    A profundidade decide empates em solver_closest_batch: entre dois valores
+    equidistantes, o nó mais raso é visitado primeiro pela busca e vence.
+    """
+    values = np.asarray(values)
+    depths = np.asarray(depths, dtype=np.int64)
+    if not len(values):
+        return values, depths
+    starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+    return values[starts], np.minimum.reduceat(depths, starts)
+
+
+# Classe BST compacta, armazenada em vetores paralelos
+class ArrayBST:
+    """
+    Árvore binária de busca que guarda os valores e os índices dos filhos em
+    vetores tipados (array.array) em vez de um objeto Node por valor.
+
+    A inserção é iterativa (sem risco de RecursionError em árvores profundas)
+    e a capacidade cresce geometricamente, dobrando quando os vetores enchem.
+    Oferece a mesma interface do BST de Codigofonte.py: add, e os solvers
+    solver_closest e solver_kth_largest aceitam esta árvore diretamente.
+    """
+
+    def __init__(self, capacity=1024, typecode='q'):
+        capacity = max(1, int(capacity))
+        self.typecode = typecode
+        self.root = NIL
+        self._count = 0
+        self._capacity = capacity
+        self._snapshot = None
+        self._values = array(typecode, [0]) * capacity
+        self._left = array('i', [NIL]) * capacity
+        self._right = array('i', [NIL]) * capacity
+
+    def __len__(self):
+        return self._count
+
+    @classmethod
+    def from_sorted(cls, arr):
+        """
+        Constrói a árvore perfeitamente balanceada a partir de um vetor já
+        ordenado. Os dados são copiados em bloco para os vetores tipados,
+        sem converter cada valor NumPy em objeto Python.
+        """
+        arr = np.asarray(arr)
+        if np.issubdtype(arr.dtype, np.integer):
+            typecode, dtype = 'q', np.int64
+        else:
+            typecode, dtype = 'd', np.float64
+        if not len(arr):
+            return cls(typecode=typecode)
+        root, left, right, _ = balanced_layout(len(arr))
+
+        tree = cls(capacity=len(arr), typecode=typecode)
+        tree._values = array(typecode, arr.astype(dtype, copy=False).tobytes())
+        tree._left = array('i', left.tobytes())
+        tree._right = array('i', right.tobytes())
+        tree._count = tree._capacity = len(arr)
+        tree.root = root
+        return tree
+
+    @classmethod
+    def from_array(cls, arr):
+        """Ordena arr uma única vez (np.sort) e chama from_sorted."""
+        return cls.from_sorted(np.sort(np.asarray(arr)))
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelos vetores da árvore, em bytes."""
+        return sum(buf.itemsize * len(buf) for buf in (self._values, self._left, self._right))
+
+    def _ensure_writable(self):
+        # Árvores carregadas com mmap usam memoryviews somente leitura;
+        # a primeira alteração copia os dados para vetores próprios
+        if not isinstance(self._values, array):
+            self._values = array(self.typecode, bytes(self._values))
+            self._left = array('i', bytes(self._left))
+            self._right = array('i', bytes(self._right))
+            self._capacity = self._count
+            if not self._capacity:
+                self._grow()
+
+    def _grow(self):
+        # Dobra a capacidade: custo amortizado O(1) por inserção
+        extra = self._capacity
+        self._values.extend(array(self.typecode, [0]) * extra)
+        self._left.extend(array('i', [NIL]) * extra)
+        self._right.extend(array('i', [NIL]) * extra)
+        self._capacity += extra
+
+    def add(self, value):
+        self._snapshot = None
+        self._ensure_writable()
+        if self._count == self._capacity:
+            self._grow()
+        new = self._count
+        values, left, right = self._values, self._left, self._right
+        values[new] = value
+        self._count += 1
+
+        if self.root == NIL:
+            self.root = new
+            return
+
+        current = self.root
+        while True:
+            if value <= values[current]:
+                child = left[current]
+                if child == NIL:
+                    left[current] = new
+                    return
+            else:
+                child = right[current]
+                if child == NIL:
+                    right[current] = new
+                    return
+            current = child
+
+    def extend(self, values):
+        """
+        Insere vários valores em sequência. Aceita listas ou arrays NumPy
+        (convertidos uma única vez com tolist, evitando escalares NumPy no laço).
+        """
+        self._snapshot = None
+        self._ensure_writable()
+        if hasattr(values, "tolist"):
+            values = values.tolist()
+        # Laço de inserção replicado aqui para evitar uma chamada de método por valor
+        for value in values:
+            if self._count == self._capacity:
+                self._grow()
+            vals, left, right = self._values, self._left, self._right
+            new = self._count
+            vals[new] = value
+            self._count = new + 1
+            current = self.root
+            if current == NIL:
+                self.root = new
+                continue
+            while True:
+                if value <= vals[current]:
+                    child = left[current]
+                    if child == NIL:
+                        left[current] = new
+                        break
+                else:
+                    child = right[current]
+                    if child == NIL:
+                        right[current] = new
+                        break
+                current = child
+
+    def closest(self, target):
+        """
+        Valor mais próximo de target, com o mesmo critério de desempate de
+        solver_closest (vence o nó visitado primeiro).
+        """
+        if self.root == NIL:
+            raise ValueError("A árvore está vazia.")
+        values, left, right = self._values, self._left, self._right
+        current = self.root
+        closest = values[current]
+        while current != NIL:
+            value = values[current]
+            if abs(target - closest) > abs(target - value):
+                closest = value
+            if target < value:
+                current = left[current]
+            elif target > value:
+                current = right[current]
+            else:
+                break
+        return closest
+
+    def kth_largest(self, k):
+        """
+        k-ésimo maior valor, consumindo apenas k itens de iter_descending:
+        O(altura + k). Diferente do BST, a ArrayBST não guarda tamanhos de
+        subárvore, então não há a consulta O(log n).
+        """
+        if k < 1 or k > self._count:
+            raise IndexError("k fora do intervalo da árvore.")
+        return next(islice(self.iter_descending(), k - 1, None))
+
+    # Iteradores preguiçosos com pilha explícita: O(altura + itens consumidos)
+    def iter_ascending(self):
+        values, left, right = self._values, self._left, self._right
+        stack = []
+        current = self.root
+        while stack or current != NIL:
+            while current != NIL:
+                stack.append(current)
+                current = left[current]
+            current = stack.pop()
+            yield values[current]
+            current = right[current]
+
+    def iter_descending(self):
+        values, left, right = self._values, self._left, self._right
+        stack = []
+        current = self.root
+        while stack or current != NIL:
+            while current != NIL:
+                stack.append(current)
+                current = right[current]
+            current = stack.pop()
+            yield values[current]
+            current = left[current]
+
+    def range(self, lo, hi):
+        """Valores v com lo <= v <= hi, em ordem crescente, sem visitar subárvores fora do intervalo."""
+        values, left, right = self._values, self._left, self._right
+        stack = []
+        current = self.root
+        while stack or current != NIL:
+            while current != NIL:
+                if values[current] < lo:
+                    current = right[current]
+                else:
+                    stack.append(current)
+                    current = left[current]
+            if not stack:
+                return
+            current = stack.pop()
+            if values[current] > hi:
+                return
+            yield values[current]
+            current = right[current]
+
+    def top_k(self, k):
+        """Os k maiores valores, do maior para o menor."""
+        return list(islice(self.iter_descending(), k))
+
+    def sorted_snapshot(self):
+        """
+        Valores distintos em ordem crescente e a menor profundidade de cada um
+        (ver closest_snapshot). As profundidades são calculadas nível a nível
+        com NumPy; o resultado fica em cache até a próxima inserção.
+        """
+        if self._snapshot is None:
+            n = self._count
+            dtype = np.int64 if self.typecode == 'q' else np.float64
+            values = np.frombuffer(self._values, dtype=dtype, count=n).copy()
+            left = np.frombuffer(self._left, dtype=np.int32, count=n).copy()
+            right = np.frombuffer(self._right, dtype=np.int32, count=n).copy()
+
+            depths = np.zeros(n, dtype=np.int64)
+            frontier = np.array([self.root] if n else [], dtype=np.int32)
+            depth = 0
+            while frontier.size:
+                depths[frontier] = depth
+                children = np.concatenate((left[frontier], right[frontier]))
+                frontier = children[children != NIL]
+                depth += 1
+
+            order = np.argsort(values, kind="stable")
+            self._snapshot = closest_snapshot(values[order], depths[order])
+        return self._snapshot
+
+    def save(self, path):
+        """Grava a árvore no formato binário plano descrito em FILE_HEADER."""
+        n = self._count
+        with open(path, "wb") as f:
+            f.write(FILE_HEADER.pack(FILE_MAGIC, n, self.root, self.typecode.encode()))
+            for buf in (self._values, self._left, self._right):
+                f.write(memoryview(buf)[:n].tobytes())
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Carrega uma árvore gravada por save. Com mmap=True os vetores são
+        mapeados com numpy.memmap (somente leitura): as consultas começam
+        imediatamente, só as páginas visitadas são lidas do disco e processos
+        que abrem o mesmo arquivo compartilham essas páginas. A primeira
+        inserção copia os dados para a memória do processo.
+        """
+        with open(path, "rb") as f:
+            magic, n, root, typecode = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+            if magic != FILE_MAGIC:
+                raise ValueError(f"{path} não é um arquivo de BST válido.")
+            typecode = typecode.decode()
+            dtype = np.int64 if typecode == 'q' else np.float64
+            if not mmap:
+                data = f.read()
+
+        tree = cls(typecode=typecode)
+        if not n:
+            return tree
+        offsets = (FILE_HEADER.size, FILE_HEADER.size + 8 * n, FILE_HEADER.size + 12 * n)
+        if mmap:
+            # memoryview sobre o memmap: indexação rápida com ints do Python
+            tree._values = memoryview(np.memmap(path, dtype=dtype, mode="r", offset=offsets[0], shape=(n,)))
+            tree._left = memoryview(np.memmap(path, dtype=np.int32, mode="r", offset=offsets[1], shape=(n,)))
+            tree._right = memoryview(np.memmap(path, dtype=np.int32, mode="r", offset=offsets[2], shape=(n,)))
+        else:
+            tree._values = array(typecode, data[:8 * n])
+            tree._left = array('i', data[8 * n:12 * n])
+            tree._right = array('i', data[12 * n:16 * n])
+        tree._count = tree._capacity = n
+        tree.root = root
+        return tree
@@ -1,7 +1,27 @@
 import osmnx as ox
 import networkx as nx
+import numpy as np
+import asyncio
+import os
+import random
+import sys
+import time
 from heapq import heappush, heappop
 
+from csr_graph import graph_to_csr, csr_shortest_path_length
+from route_search import astar_path, bidirectional_path
+from contraction_hierarchy import ContractionHierarchy, build_contraction_hierarchy
+from distance_matrix import distance_matrix
+from mst import DynamicMST, graph_edge_arrays, kruskal_arrays, kruskal_graph
+from spatial_index import SpatialIndex
+from routing_service import RoutingService
+from dijkstra_search import dijkstra_path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from osm_cache import cache_path, load_graph
+
+PLACE_NAME = "Natal, Brazil"
+
 
 # ==== Função para preparar o grafo ====
 def prepare_graph(graph):
@@ -28,6 +48,7 @@ def dijkstra_min_heap(graph, source, target):
     """
     distances = {node: float('inf') for node in graph.nodes}
     distances[source] = 0
+    multigraph = graph.is_multigraph()
     
     priority_queue = [(0, source)]
     
@@ -38,7 +59,11 @@ def dijkstra_min_heap(graph, source, target):
             continue
         
         for neighbor, data in graph[current_node].items():
-            weight = data.get('length', 1)
+            if multigraph:
+                # Em MultiGraph, data é {chave: atributos}; vale a menor aresta paralela
+                weight = min(edge.get('length', 1) for edge in data.values())
+            else:
+                weight = data.get('length', 1)
             distance = current_distance + weight
             if distance < distances[neighbor]:
                 distances[neighbor] = distance
@@ -57,15 +82,24 @@ def dijkstra_networkx(graph, source, target):
 
 
 # ==== Função para visualizar caminhos do Dijkstra ====
-def visualize_dijkstra_paths(graph, source_name, target_name, points_of_interest):
+def visualize_dijkstra_paths(graph, source_name, target_name, points_of_interest, index=None):
     """
     Visualiza o menor caminho entre dois locais em Natal-RN usando o algoritmo de Dijkstra.
+    Com index (SpatialIndex), os dois pontos são localizados numa única consulta.
     """
-    source = ox.distance.nearest_nodes(graph, *points_of_interest[source_name][::-1])
-    target = ox.distance.nearest_nodes(graph, *points_of_interest[target_name][::-1])
+    if index is not None:
+        (source, target), _ = index.snap(*zip(points_of_interest[source_name], points_of_interest[target_name]))
+    else:
+        source = ox.distance.nearest_nodes(graph, *points_of_interest[source_name][::-1])
+        target = ox.distance.nearest_nodes(graph, *points_of_interest[target_name][::-1])
     
     path = nx.shortest_path(graph, source=source, target=target, weight="length")
-    
+    plot_route(graph, path)
+
+
+# ==== Função para desenhar uma rota já calculada ====
+def plot_route(graph, path):
+    """Desenha path (lista de nós) sobre o mapa, em vermelho."""
     ox.plot_graph_route(
         graph,
         route=path,
@@ -81,13 +115,13 @@ def visualize_dijkstra_paths(graph, source_name, target_name, points_of_interest
 
 
 # ==== Função para visualizar a MST ====
-def visualize_kruskal_mst():
+def visualize_kruskal_mst(graph_path=None):
     """
     Visualiza a Árvore Geradora Mínima (MST) no grafo de Natal-RN,
-    com ajustes para melhorar a legibilidade.
+    com ajustes para melhorar a legibilidade. graph_path permite usar um
+    arquivo local em vez do cache/download (ver osm_cache.load_graph).
     """
-    place_name = "Natal, Brazil"
-    graph = ox.graph_from_place(place_name, network_type="drive")
+    graph = load_graph(PLACE_NAME, network_type="drive", path=graph_path)
     
     mst = kruskal_mst(graph)
     
@@ -102,14 +136,112 @@ def visualize_kruskal_mst():
     )
 
 
+# ==== Função para medir os algoritmos ponto a ponto ====
+def benchmark_point_to_point(graph, csr, node_pairs, repetitions=5):
+    """
+    Mede, para cada par (origem, destino), o tempo médio de dijkstra_networkx,
+    dijkstra_min_heap, do Dijkstra sobre CSR, do Dijkstra bidirecional e do A*
+    com heurística haversine, conferindo se as distâncias coincidem.
+    """
+    methods = {
+        "NetworkX": lambda s, t: dijkstra_networkx(graph, s, t),
+        "Min-Heap": lambda s, t: dijkstra_min_heap(graph, s, t),
+        "Min-Heap limitada": lambda s, t: dijkstra_path(graph, s, t)[0],
+        "CSR": lambda s, t: csr_shortest_path_length(csr, s, t),
+        "Bidirecional": lambda s, t: bidirectional_path(csr, s, t)[0],
+        "A*": lambda s, t: astar_path(csr, s, t)[0],
+    }
+    results = {}
+    for label, (source, target) in node_pairs.items():
+        print(f"{label}:")
+        results[label] = {}
+        reference = None
+        for name, method in methods.items():
+            start = time.perf_counter()
+            for _ in range(repetitions):
+                length = method(source, target)
+            elapsed = (time.perf_counter() - start) / repetitions
+            reference = length if reference is None else reference
+            status = "ok" if length == reference or abs(length - reference) < 1e-6 else "DIVERGENTE"
+            results[label][name] = {"length": length, "seconds": elapsed}
+            print(f"  {name:<17} {length:10.1f} m  {elapsed * 1000:9.2f} ms  {status}")
+        _, path, operations = dijkstra_path(graph, source, target)
+        results[label]["heap_operations"] = operations
+        print(f"  caminho com {len(path)} nós; operações na heap: {operations}")
+    return results
+
+
+# ==== Função para localizar os pontos de interesse no grafo ====
+def snap_points(index, points_of_interest):
+    """Nó mais próximo de cada ponto (lat, lon), numa única consulta ao SpatialIndex."""
+    names = list(points_of_interest)
+    lats = [points_of_interest[name][0] for name in names]
+    lons = [points_of_interest[name][1] for name in names]
+    node_ids, _ = index.snap(lats, lons)
+    return dict(zip(names, node_ids.tolist()))
+
+
+# ==== Função para carregar o índice espacial ====
+def load_spatial_index(graph, graph_path=None, path=None):
+    """
+    Carrega o SpatialIndex gravado em path ou, se não existir ou não
+    corresponder ao grafo (nós ou coordenadas diferentes), constrói e grava.
+    Por padrão o arquivo fica ao lado do grafo: junto ao arquivo local
+    graph_path ou ao cache de osm_cache.
+    """
+    if path is None:
+        if graph_path:
+            path = os.path.splitext(graph_path)[0] + "-indice.npz"
+        else:
+            path = cache_path(PLACE_NAME, "drive").replace(".npz", "-indice.npz")
+    if os.path.exists(path):
+        try:
+            index = SpatialIndex.load(path)
+        except ValueError:
+            index = None
+        if index is not None and index.matches(graph):
+            return index
+        print(f"{path} não corresponde ao grafo carregado; reconstruindo o índice espacial...")
+    index = SpatialIndex.from_graph(graph)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    index.save(path)
+    return index
+
+
+# ==== Função para imprimir a matriz de distâncias ====
+def print_distance_matrix(names, matrix):
+    """Imprime a matriz em km, com os nomes abreviados nas colunas."""
+    width = max(len(name) for name in names)
+    print(" " * width + "".join(f"{name[:8]:>10}" for name in names))
+    for name, row in zip(names, matrix):
+        print(f"{name:<{width}}" + "".join(f"{value / 1000:10.2f}" for value in row))
+
+
+# ==== Função para rotear pelo serviço com cache ====
+def route_with_service(service, node_pairs, rounds=2):
+    """
+    Envia todas as rotas de node_pairs ao RoutingService de forma concorrente,
+    rounds vezes, e imprime as estatísticas do cache: origens repetidas
+    reaproveitam a mesma árvore de caminhos mínimos.
+    """
+    async def route_all():
+        return await asyncio.gather(*(service.route(s, t) for s, t in node_pairs.values()))
+    
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = asyncio.run(route_all())
+        elapsed = time.perf_counter() - start
+        print(f"{len(results)} rotas em {elapsed * 1000:.1f} ms | {service.stats_dict()}")
+    return dict(zip(node_pairs, results))
+
+
 # ==== Função para comparar Dijkstra ====
-def compare_dijkstra():
+def compare_dijkstra(graph_path=None):
     """
     Compara os caminhos mais curtos calculados pelos algoritmos de Dijkstra 
     (Min-Heap e NetworkX) para 10 pares de locais em Natal-RN.
     """
-    place_name = "Natal, Brazil"
-    graph = ox.graph_from_place(place_name, network_type="drive")
+    graph = load_graph(PLACE_NAME, network_type="drive", path=graph_path)
     graph = prepare_graph(graph)
     
     points_of_interest = {
@@ -133,25 +265,158 @@ def compare_dijkstra():
         ("Museu Câmara Cascudo", "UFRN (Campus Central)"),
     ]
     
+    # Conversão única do grafo para CSR e localização única dos pontos,
+    # reaproveitadas em todas as consultas
+    csr = graph_to_csr(graph)
+    nodes = snap_points(load_spatial_index(graph, graph_path), points_of_interest)
+    node_pairs = {f"{s} → {t}": (nodes[s], nodes[t]) for s, t in pairs}
+    
+    benchmark_point_to_point(graph, csr, node_pairs)
+    
+    # Matriz 10×10 com um Dijkstra por origem; os caminhos são reaproveitados nos mapas
+    names = list(points_of_interest)
+    position = {name: i for i, name in enumerate(names)}
+    node_list = [nodes[name] for name in names]
+    matrix, paths = distance_matrix(csr, node_list, node_list, paths=True)
+    print("=== Matriz de distâncias (km) ===")
+    print_distance_matrix(names, matrix)
+    
+    print("=== Serviço de rotas com cache de árvores ===")
+    service = RoutingService(csr)
+    route_with_service(service, {f"{s} → {t}": (nodes[s], nodes[t]) for s in names for t in names})
+    
     for source_name, target_name in pairs:
         print(f"Visualizando caminho: {source_name} → {target_name}")
-        visualize_dijkstra_paths(graph, source_name, target_name, points_of_interest)
+        plot_route(graph, paths[position[source_name]][position[target_name]])
+
+
+# ==== Função para preparar a hierarquia de contração ====
+def prepare_contraction_hierarchy(graph, graph_path=None, path=None):
+    """
+    Pré-processamento offline: carrega a hierarquia de contração gravada em
+    path ou, se não existir ou não corresponder ao grafo de prepare_graph
+    (nós, arcos ou comprimentos diferentes), constrói e grava em disco para
+    as próximas execuções. Por padrão o arquivo fica ao lado do grafo:
+    junto ao arquivo local graph_path ou ao cache de osm_cache.
+    """
+    if path is None:
+        if graph_path:
+            path = os.path.splitext(graph_path)[0] + "-hierarquia.npz"
+        else:
+            path = cache_path(PLACE_NAME, "drive").replace(".npz", "-hierarquia.npz")
+    csr = graph_to_csr(graph)
+    if os.path.exists(path):
+        try:
+            hierarchy = ContractionHierarchy.load(path)
+        except ValueError:
+            hierarchy = None
+        if hierarchy is not None and hierarchy.matches(csr):
+            return hierarchy
+        print(f"{path} não corresponde ao grafo carregado; reconstruindo a hierarquia...")
+    start = time.perf_counter()
+    hierarchy = build_contraction_hierarchy(csr)
+    print(f"Hierarquia construída em {time.perf_counter() - start:.1f} s "
+          f"({hierarchy.num_shortcuts} atalhos)")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    hierarchy.save(path)
+    return hierarchy
+
+
+# ==== Função para validar a hierarquia de contração ====
+def validate_contraction_hierarchy(graph, hierarchy, samples=100, seed=42):
+    """
+    Compara hierarchy.shortest_path_length com dijkstra_min_heap em pares
+    aleatórios de nós e imprime o tempo médio por consulta de cada um.
+    Retorna o número de pares em que as distâncias divergem.
+    """
+    rng = random.Random(seed)
+    nodes = list(graph.nodes)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(samples)]
+    
+    start = time.perf_counter()
+    expected = [dijkstra_min_heap(graph, source, target) for source, target in pairs]
+    heap_time = (time.perf_counter() - start) / samples
+    
+    start = time.perf_counter()
+    lengths = [hierarchy.shortest_path_length(source, target) for source, target in pairs]
+    ch_time = (time.perf_counter() - start) / samples
+    
+    mismatches = sum(1 for a, b in zip(lengths, expected) if a != b and abs(a - b) > 1e-6)
+    print(f"Min-Heap: {heap_time * 1e6:.0f} µs/consulta | "
+          f"Hierarquia: {ch_time * 1e6:.0f} µs/consulta | "
+          f"{mismatches} divergências em {samples} pares")
+    return mismatches
 
 
 # ==== Função para calcular a MST ====
 def kruskal_mst(graph):
     """
-    Calcula a Árvore Geradora Mínima (MST) usando o algoritmo de Kruskal.
+    Calcula a Árvore Geradora Mínima (MST) usando o algoritmo de Kruskal
+    (implementação própria sobre vetores de arestas, ver mst.py).
     """
     graph = prepare_graph(graph)
-    mst = nx.minimum_spanning_tree(graph, weight='length')
+    mst = kruskal_graph(graph, weight='length')
     return mst
 
 
+# ==== Função para medir Kruskal e a MST incremental ====
+def benchmark_mst(graph, updates=200, seed=42):
+    """
+    Compara o tempo de nx.minimum_spanning_tree com o Kruskal próprio e o
+    custo de atualizar a MST incrementalmente (inserção, remoção e mudança
+    de peso de arestas) com o de reconstruí-la a cada alteração.
+    """
+    start = time.perf_counter()
+    reference = nx.minimum_spanning_tree(graph, weight='length')
+    nx_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    nodes, edges, u, v, w = graph_edge_arrays(graph)
+    chosen = kruskal_arrays(len(nodes), u, v, w)
+    native_time = time.perf_counter() - start
+    
+    reference_weight = reference.size(weight='length')
+    print(f"NetworkX: {nx_time * 1000:.1f} ms | Kruskal (vetores): {native_time * 1000:.1f} ms | "
+          f"peso {reference_weight:.1f} vs {w[chosen].sum():.1f}")
+    
+    rng = random.Random(seed)
+    dynamic = DynamicMST.from_arrays(len(nodes), u, v, w)
+    start = time.perf_counter()
+    for _ in range(updates):
+        operation = rng.random()
+        alive = dynamic.edge_ids()
+        if operation < 1 / 3:
+            dynamic.insert_edge(rng.randrange(len(nodes)), rng.randrange(len(nodes)), rng.uniform(10, 500))
+        elif operation < 2 / 3:
+            dynamic.delete_edge(int(rng.choice(alive)))
+        else:
+            dynamic.update_weight(int(rng.choice(alive)), rng.uniform(10, 500))
+    incremental_time = (time.perf_counter() - start) / updates
+    
+    # Reconstrução do zero para o estado final, como seria a cada alteração
+    alive = dynamic.edge_ids()
+    start = time.perf_counter()
+    rebuilt = kruskal_arrays(len(nodes), dynamic.u[alive], dynamic.v[alive], dynamic.w[alive])
+    rebuild_time = time.perf_counter() - start
+    print(f"Atualização incremental: {incremental_time * 1000:.2f} ms/alteração | "
+          f"reconstrução: {rebuild_time * 1000:.2f} ms | "
+          f"peso {dynamic.total_weight:.1f} vs {dynamic.w[alive][rebuilt].sum():.1f}")
+
+
 # ==== Execução Principal ====
 if __name__ == "__main__":
+    # Opcional: caminho de um grafo local (.npz, .graphml ou .osm) para rodar offline
+    graph_path = sys.argv[1] if len(sys.argv) > 1 else None
+    
     print("=== Comparando Dijkstra (Min-Heap) com NetworkX ===")
-    compare_dijkstra()
+    compare_dijkstra(graph_path)
+    
+    print("=== Validando a hierarquia de contração ===")
+    graph = prepare_graph(load_graph(PLACE_NAME, network_type="drive", path=graph_path))
+    validate_contraction_hierarchy(graph, prepare_contraction_hierarchy(graph, graph_path))
+    
+    print("=== Medindo Kruskal e a MST incremental ===")
+    benchmark_mst(graph)
     
     print("=== Visualizando MST com Kruskal ===")
-    visualize_kruskal_mst()
+    visualize_kruskal_mst(graph_path)
@@ -0,0 +1,285 @@
+"""
+Benchmark offline dos algoritmos de menor caminho do U2T3, sem acesso à rede.
+
+Gera grafos sintéticos parecidos com malhas viárias (grades com ruas
+faltando e grafos geométricos aleatórios), com coordenadas x/y em torno de
+Natal e pesos 'length' em metros, e mede cada implementação de menor
+caminho: dijkstra_min_heap, dijkstra_networkx, dijkstra_path (heap
+limitada), o Dijkstra sobre CSR, o Dijkstra bidirecional, o A* e a
+hierarquia de contração. Confere se todas dão a mesma distância que o
+NetworkX e grava os resultados em JSON, com gráficos de escala opcionais.
+
+Exemplos:
+    python benchmark.py --sizes 1000 10000 100000 --output resultados.json --plot escala.png
+    python benchmark.py --sizes 1000000 --families grid --implementations csr bidirectional astar
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+import networkx as nx
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy import stats
+
+from U2T3 import dijkstra_min_heap, dijkstra_networkx
+from contraction_hierarchy import build_contraction_hierarchy
+from csr_graph import csr_shortest_path_length, graph_to_csr
+from dijkstra_search import dijkstra_path
+from route_search import EARTH_RADIUS_M, astar_path, bidirectional_path, haversine
+
+# Origem das coordenadas sintéticas (centro aproximado de Natal)
+ORIGIN_LAT, ORIGIN_LON = -5.8, -35.2
+# Espaçamento médio entre cruzamentos (metros)
+BLOCK_M = 100.0
+# Fração de ruas removidas da grade
+GRID_DROP = 0.1
+# Grau médio desejado no grafo geométrico
+GEOMETRIC_DEGREE = 6.0
+
+
+# Função para converter metros (x, y) em longitude/latitude em torno da origem
+def to_lon_lat(x_m, y_m):
+    lat = ORIGIN_LAT + np.degrees(y_m / EARTH_RADIUS_M)
+    lon = ORIGIN_LON + np.degrees(x_m / (EARTH_RADIUS_M * np.cos(np.radians(ORIGIN_LAT))))
+    return lon, lat
+
+
+# Função para montar o grafo NetworkX a partir de vetores
+def assemble_graph(lon, lat, u, v, rng):
+    """
+    Grafo não-direcionado com x/y nos nós e 'length' nas arestas: a distância
+    em linha reta multiplicada por um fator de sinuosidade entre 1 e 1,2
+    (nunca menor que a reta, como nas ruas reais).
+    """
+    length = haversine(lon[u], lat[u], lon[v], lat[v]) * rng.uniform(1.0, 1.2, size=len(u))
+    graph = nx.Graph()
+    graph.add_nodes_from((i, {"x": x, "y": y}) for i, (x, y) in enumerate(zip(lon.tolist(), lat.tolist())))
+    graph.add_edges_from((a, b, {"length": w}) for a, b, w in zip(u.tolist(), v.tolist(), length.tolist()))
+    return graph
+
+
+# Função para gerar uma grade com ruas faltando
+def grid_graph(size, seed=42):
+    """Grade de aproximadamente size cruzamentos, com deslocamentos aleatórios e 10% das ruas removidas."""
+    rng = np.random.default_rng(seed)
+    side = max(2, int(round(np.sqrt(size))))
+    ids = np.arange(side * side).reshape(side, side)
+    u = np.concatenate((ids[:, :-1].ravel(), ids[:-1, :].ravel()))
+    v = np.concatenate((ids[:, 1:].ravel(), ids[1:, :].ravel()))
+    keep = rng.random(len(u)) >= GRID_DROP
+    rows, cols = np.divmod(np.arange(side * side), side)
+    jitter = rng.uniform(-0.2, 0.2, size=(2, side * side)) * BLOCK_M
+    lon, lat = to_lon_lat(cols * BLOCK_M + jitter[0], rows * BLOCK_M + jitter[1])
+    return assemble_graph(lon, lat, u[keep], v[keep], rng)
+
+
+# Função para gerar um grafo geométrico aleatório
+def geometric_graph(size, seed=42):
+    """Pontos uniformes num quadrado com densidade de uma cidade, ligados até um raio de grau médio ~6."""
+    rng = np.random.default_rng(seed)
+    side_m = np.sqrt(size) * BLOCK_M
+    points = rng.uniform(0, side_m, size=(size, 2))
+    radius = BLOCK_M * np.sqrt(GEOMETRIC_DEGREE / np.pi)
+    pairs = cKDTree(points).query_pairs(radius, output_type="ndarray")
+    lon, lat = to_lon_lat(points[:, 0], points[:, 1])
+    return assemble_graph(lon, lat, pairs[:, 0], pairs[:, 1], rng)
+
+
+FAMILIES = {"grid": grid_graph, "geometric": geometric_graph}
+
+
+# Implementações: função que prepara (uma vez por grafo) e devolve a consulta
+IMPLEMENTATIONS = {
+    "networkx": lambda graph, csr: lambda s, t: dijkstra_networkx(graph, s, t),
+    "min_heap": lambda graph, csr: lambda s, t: dijkstra_min_heap(graph, s, t),
+    "bounded_heap": lambda graph, csr: lambda s, t: dijkstra_path(graph, s, t)[0],
+    "csr": lambda graph, csr: lambda s, t: csr_shortest_path_length(csr, s, t),
+    "bidirectional": lambda graph, csr: lambda s, t: bidirectional_path(csr, s, t)[0],
+    "astar": lambda graph, csr: lambda s, t: astar_path(csr, s, t)[0],
+    "contraction_hierarchy": lambda graph, csr: build_contraction_hierarchy(csr).shortest_path_length,
+}
+
+
+# Implementações que usam o grafo NetworkX direto (sem conversão para CSR)
+GRAPH_IMPLEMENTATIONS = ("networkx", "min_heap", "bounded_heap")
+
+
+# Função para medir uma chamada em nanossegundos
+def time_ns(func, *args):
+    start = time.perf_counter_ns()
+    result = func(*args)
+    return time.perf_counter_ns() - start, result
+
+
+# Função para calcular média, mediana e IC de 95% de uma lista de tempos
+def summarize(times):
+    mean = float(np.mean(times))
+    if len(times) < 2:
+        return mean, float(np.median(times)), 0.0
+    interval = stats.t.interval(0.95, len(times) - 1, loc=mean, scale=np.std(times, ddof=1))
+    return mean, float(np.median(times)), float(interval[1] - mean)
+
+
+# Função para escolher pares de consulta na maior componente
+def query_pairs(graph, queries, seed):
+    rng = np.random.default_rng(seed)
+    component = np.fromiter(max(nx.connected_components(graph), key=len), dtype=np.int64)
+    return [tuple(int(n) for n in rng.choice(component, size=2, replace=False)) for _ in range(queries)]
+
+
+# Função para medir todas as implementações em um grafo
+def run_cell(family, size, implementations=None, queries=5, warmup=1, seed=42, ch_max_nodes=20000):
+    """
+    Gera o grafo (fora da medição), converte para CSR uma vez e, para cada
+    implementação, mede a preparação e queries consultas entre pares
+    aleatórios da maior componente, após warmup consultas descartadas.
+    Cada distância é comparada com a do NetworkX.
+    Retorna uma linha por implementação.
+    """
+    implementations = implementations or list(IMPLEMENTATIONS)
+    graph = FAMILIES[family](size, seed)
+    csr_ns, csr = time_ns(graph_to_csr, graph)
+    pairs = query_pairs(graph, queries + warmup, seed)
+    reference = [dijkstra_networkx(graph, s, t) for s, t in pairs[warmup:]]
+
+    rows = []
+    for name in implementations:
+        row = {"family": family, "size": size, "nodes": graph.number_of_nodes(),
+               "edges": graph.number_of_edges(), "implementation": name, "queries": queries}
+        if name == "contraction_hierarchy" and graph.number_of_nodes() > ch_max_nodes:
+            row["skipped"] = f"mais de {ch_max_nodes} nós"
+            rows.append(row)
+            continue
+        prep_ns, query = time_ns(IMPLEMENTATIONS[name], graph, csr)
+        for s, t in pairs[:warmup]:
+            query(s, t)
+        times, lengths = [], []
+        for s, t in pairs[warmup:]:
+            elapsed, length = time_ns(query, s, t)
+            times.append(elapsed)
+            lengths.append(length)
+        mean, median, conf_interval = summarize(times)
+        errors = [abs(a - b) for a, b in zip(lengths, reference)]
+        row.update(
+            # networkx, min_heap e bounded_heap consultam o grafo direto, sem preparação
+            prep_ns=prep_ns + csr_ns if name not in GRAPH_IMPLEMENTATIONS else 0,
+            query_ns_mean=mean, query_ns_median=median, query_ns_ci=conf_interval,
+            max_abs_error=max(errors) if errors else 0.0,
+            agrees=all(error <= 1e-6 for error in errors),
+        )
+        rows.append(row)
+    return rows
+
+
+# Função para varrer famílias e tamanhos
+def run_benchmark(sizes, families=("grid", "geometric"), implementations=None, queries=5, warmup=1,
+                  seed=42, ch_max_nodes=20000, verbose=True):
+    rows = []
+    for size in sizes:
+        for family in families:
+            cell_rows = run_cell(family, size, implementations, queries, warmup, seed, ch_max_nodes)
+            rows.extend(cell_rows)
+            if verbose:
+                for row in cell_rows:
+                    print(format_row(row))
+    return rows
+
+
+# Função para formatar uma linha de resultado
+def format_row(row):
+    label = f"{row['family']:>9} {row['nodes']:>8} nós {row['implementation']:>22}"
+    if "skipped" in row:
+        return f"{label}  ignorado ({row['skipped']})"
+    status = "ok" if row["agrees"] else f"DIVERGENTE (erro {row['max_abs_error']:.3g})"
+    return (f"{label}  preparo {row['prep_ns'] / 1e6:10.1f} ms"
+            f"  consulta {row['query_ns_mean'] / 1e6:10.3f} ms ± {row['query_ns_ci'] / 1e6:.3f}  {status}")
+
+
+# Função para salvar os gráficos de escala
+def plot_benchmark(rows, path):
+    """
+    Salva em path uma figura com uma linha por família de grafo: à esquerda
+    o tempo médio de consulta e à direita o tempo de preparação, ambos em
+    função do número de nós (escala log-log). Usa o backend Agg, sem janela.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    rows = [row for row in rows if "skipped" not in row]
+    families = list(dict.fromkeys(row["family"] for row in rows))
+    fig, axes = plt.subplots(len(families), 2, figsize=(14, 5 * len(families)), squeeze=False)
+    for (ax_query, ax_prep), family in zip(axes, families):
+        series = {}
+        for row in rows:
+            if row["family"] == family:
+                series.setdefault(row["implementation"], []).append(row)
+        for name, points in series.items():
+            points.sort(key=lambda row: row["nodes"])
+            nodes = [row["nodes"] for row in points]
+            ax_query.errorbar(nodes, [row["query_ns_mean"] / 1e6 for row in points],
+                              yerr=[row["query_ns_ci"] / 1e6 for row in points], fmt='o-', capsize=3, label=name)
+            if any(row["prep_ns"] for row in points):
+                ax_prep.plot(nodes, [max(row["prep_ns"], 1) / 1e6 for row in points], 'o-', label=name)
+        ax_query.set_title(f"{family}: tempo por consulta")
+        ax_prep.set_title(f"{family}: tempo de preparação")
+        for ax in (ax_query, ax_prep):
+            ax.set_xscale("log")
+            ax.set_yscale("log")
+            ax.set_xlabel("Número de nós")
+            ax.set_ylabel("ms")
+            ax.grid(True)
+            if ax.has_data():
+                ax.legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+# Função para salvar os resultados em JSON (com metadados do ambiente)
+def save_json(rows, path, params=None):
+    document = {
+        "metadata": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "networkx": nx.__version__,
+            "platform": platform.platform(),
+            "params": params or {},
+        },
+        "results": rows,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline dos algoritmos de menor caminho (U2T3).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5])
+    parser.add_argument("--families", nargs="+", default=list(FAMILIES), choices=list(FAMILIES))
+    parser.add_argument("--implementations", nargs="+", choices=list(IMPLEMENTATIONS))
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ch-max-nodes", type=int, default=20000,
+                        help="maior grafo em que a hierarquia de contração é construída (padrão: 20000)")
+    parser.add_argument("--output", help="arquivo JSON de saída")
+    parser.add_argument("--plot", help="arquivo de imagem com os gráficos de escala")
+    args = parser.parse_args(argv)
+
+    params = {name: value for name, value in vars(args).items() if name not in ("output", "plot")}
+    rows = run_benchmark(args.sizes, args.families, args.implementations, queries=args.queries,
+                         warmup=args.warmup, seed=args.seed, ch_max_nodes=args.ch_max_nodes)
+    if args.output:
+        save_json(rows, args.output, params)
+    if args.plot:
+        plot_benchmark(rows, args.plot)
+    return 0 if all(row.get("agrees", True) for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
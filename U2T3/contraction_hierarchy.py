@@ -0,0 +1,314 @@
+from heapq import heappush, heappop
+from math import inf
+
+import numpy as np
+
+# Limite de nós assentados em cada busca de testemunha: buscas mais curtas
+# deixam a preparação mais rápida ao custo de alguns atalhos desnecessários
+WITNESS_SETTLE_LIMIT = 500
+FORMAT_VERSION = 2
+
+
+# ==== Função para o pré-processamento (contração dos nós) ====
+def build_contraction_hierarchy(csr, settle_limit=WITNESS_SETTLE_LIMIT):
+    """
+    Contrai os nós do CSRGraph um a um, na ordem dada por uma fila de
+    prioridade com atualização preguiçosa (diferença de arestas, vizinhos
+    já contraídos e nível). Ao contrair v, cada caminho u → v → x sem caminho
+    alternativo (testemunha) de mesmo custo vira um atalho u → x.
+    Retorna a ContractionHierarchy pronta para consultas.
+    """
+    n = csr.num_nodes
+    offsets, neighbors, weights = csr.adjacency_lists()
+    out_edges = [{} for _ in range(n)]
+    in_edges = [{} for _ in range(n)]
+    for u in range(n):
+        for v, w in zip(neighbors[offsets[u]:offsets[u + 1]], weights[offsets[u]:offsets[u + 1]]):
+            if w < out_edges[u].get(v, inf):
+                out_edges[u][v] = w
+                in_edges[v][u] = w
+    middle = {}
+    deleted_neighbors = [0] * n
+    level = [0] * n
+
+    def witness_distances(source, excluded, targets, max_distance):
+        # Dijkstra limitado a partir de source, ignorando o nó sendo contraído
+        distances = {source: 0.0}
+        remaining = set(targets)
+        priority_queue = [(0.0, source)]
+        settled = 0
+        while priority_queue and remaining:
+            current_distance, current_node = heappop(priority_queue)
+            if current_distance > distances[current_node]:
+                continue
+            if current_distance > max_distance or settled >= settle_limit:
+                break
+            settled += 1
+            remaining.discard(current_node)
+            for neighbor, weight in out_edges[current_node].items():
+                if neighbor == excluded:
+                    continue
+                distance = current_distance + weight
+                if distance < distances.get(neighbor, inf):
+                    distances[neighbor] = distance
+                    heappush(priority_queue, (distance, neighbor))
+        return distances
+
+    def shortcuts_for(v):
+        shortcuts = []
+        outgoing = out_edges[v]
+        if not outgoing:
+            return shortcuts
+        max_out = max(outgoing.values())
+        for u, weight_in in in_edges[v].items():
+            targets = [x for x in outgoing if x != u]
+            if not targets:
+                continue
+            distances = witness_distances(u, v, targets, weight_in + max_out)
+            for x in targets:
+                total = weight_in + outgoing[x]
+                if distances.get(x, inf) > total:
+                    shortcuts.append((u, x, total))
+        return shortcuts
+
+    def priority(v):
+        edge_difference = len(shortcuts_for(v)) - len(in_edges[v]) - len(out_edges[v])
+        return 2 * edge_difference + deleted_neighbors[v] + level[v]
+
+    queue = [(priority(v), v) for v in range(n)]
+    queue.sort()
+    order = []
+    up = [None] * n
+    down = [None] * n
+    contracted = bytearray(n)
+
+    while queue:
+        _, v = heappop(queue)
+        if contracted[v]:
+            continue
+        # Atualização preguiçosa: se a prioridade piorou, devolve à fila
+        current = priority(v)
+        if queue and current > queue[0][0]:
+            heappush(queue, (current, v))
+            continue
+
+        for u, x, total in shortcuts_for(v):
+            if total < out_edges[u].get(x, inf):
+                out_edges[u][x] = total
+                in_edges[x][u] = total
+                middle[(u, x)] = v
+
+        # As arestas restantes de v levam a nós de ordem maior
+        up[v] = list(out_edges[v].items())
+        down[v] = list(in_edges[v].items())
+        for x in out_edges[v]:
+            del in_edges[x][v]
+        for u in in_edges[v]:
+            del out_edges[u][v]
+        out_edges[v] = {}
+        in_edges[v] = {}
+        contracted[v] = 1
+        order.append(v)
+
+        # Vizinhos de v: contam mais um vizinho contraído e sobem de nível
+        # (a nova prioridade é calculada quando saírem da fila)
+        for neighbor in {x for x, _ in up[v]} | {u for u, _ in down[v]}:
+            deleted_neighbors[neighbor] += 1
+            level[neighbor] = max(level[neighbor], level[v] + 1)
+
+    def pack(arcs, middle_key):
+        counts = np.fromiter((len(a) for a in arcs), dtype=np.int64, count=n)
+        arc_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=arc_offsets[1:])
+        flat = [(v, other, w) for v, a in enumerate(arcs) for other, w in a]
+        others = np.array([other for _, other, _ in flat], dtype=np.int32)
+        arc_weights = np.array([w for _, _, w in flat], dtype=np.float64)
+        middles = np.array([middle.get(middle_key(v, other), -1) for v, other, _ in flat], dtype=np.int32)
+        return arc_offsets, others, arc_weights, middles
+
+    rank = np.empty(n, dtype=np.int32)
+    rank[np.array(order, dtype=np.int64)] = np.arange(n, dtype=np.int32)
+    return ContractionHierarchy(
+        csr.node_ids, rank,
+        *pack(up, lambda v, x: (v, x)),
+        *pack(down, lambda v, u: (u, v)),
+        source_edges=csr.num_edges, source_weight=float(csr.weights.sum()),
+    )
+
+
+# ==== Estrutura de consulta da hierarquia ====
+def _arc_lists(offsets, ends, weights):
+    # Fatia os vetores CSR em uma lista de pares (vizinho, peso) por nó
+    pairs = list(zip(ends.tolist(), weights.tolist()))
+    bounds = offsets.tolist()
+    return [pairs[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+class ContractionHierarchy:
+    """
+    Grafo de busca da hierarquia em vetores planos no formato CSR: up_* guarda
+    os arcos v → x para nós de ordem maior e down_* os arcos u → v vindos de
+    nós de ordem maior (indexados por v). *_middle é o nó contraído que cada
+    atalho substitui (-1 para arestas originais), usado para desempacotar o
+    caminho. source_edges e source_weight (número de arcos e soma dos pesos
+    do CSRGraph de origem) permitem conferir se a hierarquia gravada ainda
+    corresponde ao grafo (matches).
+    """
+
+    def __init__(self, node_ids, rank,
+                 up_offsets, up_targets, up_weights, up_middle,
+                 down_offsets, down_sources, down_weights, down_middle,
+                 source_edges=-1, source_weight=inf):
+        self.node_ids = node_ids
+        self.source_edges = source_edges
+        self.source_weight = source_weight
+        self.rank = rank
+        self.up_offsets = up_offsets
+        self.up_targets = up_targets
+        self.up_weights = up_weights
+        self.up_middle = up_middle
+        self.down_offsets = down_offsets
+        self.down_sources = down_sources
+        self.down_weights = down_weights
+        self.down_middle = down_middle
+        self._node_list = node_ids.tolist()
+        self.index = {node: i for i, node in enumerate(self._node_list)}
+        # Arcos de cada nó como listas de pares (vizinho, peso) do Python, para
+        # o laço de consulta (sem fatiar vetores nem ler escalares NumPy)
+        self._up = _arc_lists(up_offsets, up_targets, up_weights)
+        self._down = _arc_lists(down_offsets, down_sources, down_weights)
+
+    @property
+    def num_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def num_shortcuts(self):
+        return int(np.count_nonzero(self.up_middle >= 0) + np.count_nonzero(self.down_middle >= 0))
+
+    def matches(self, csr):
+        """True se a hierarquia foi construída a partir de um grafo igual a csr (mesmos nós, arcos e pesos)."""
+        return (self.num_nodes == csr.num_nodes
+                and self.source_edges == csr.num_edges
+                and bool(np.isclose(self.source_weight, float(csr.weights.sum())))
+                and all(node in csr.index for node in self._node_list))
+
+    def query(self, source, target):
+        """
+        Dijkstra bidirecional só "para cima": a busca direta usa os arcos up
+        a partir de source e a reversa os arcos down a partir de target. Cada
+        lado para quando o topo da sua heap alcança o melhor caminho.
+        Retorna (distância, nó de encontro, predecessores diretos, reversos).
+        """
+        if source == target:
+            return 0.0, source, {source: -1}, {target: -1}
+        arcs = (self._up, self._down)
+        distances = ({source: 0.0}, {target: 0.0})
+        predecessors = ({source: -1}, {target: -1})
+        queues = ([(0.0, source)], [(0.0, target)])
+        best, meeting = inf, -1
+        side = 0
+        while True:
+            queue = queues[side]
+            if not queue:
+                if not queues[1 - side]:
+                    break
+                side = 1 - side
+                continue
+            current_distance, current_node = heappop(queue)
+            dist = distances[side]
+            if current_distance > dist[current_node]:
+                continue
+            if current_distance >= best:
+                queue.clear()
+                side = 1 - side
+                continue
+            other = distances[1 - side]
+            if current_node in other and current_distance + other[current_node] < best:
+                best, meeting = current_distance + other[current_node], current_node
+
+            # Stall-on-demand: se um nó de ordem maior já alcançado chega aqui
+            # por menos, current_node não está em nenhum caminho mínimo
+            get = dist.get
+            for neighbor, weight in arcs[1 - side][current_node]:
+                if get(neighbor, inf) + weight < current_distance:
+                    break
+            else:
+                predecessor = predecessors[side]
+                for neighbor, weight in arcs[side][current_node]:
+                    distance = current_distance + weight
+                    if distance < get(neighbor, inf):
+                        dist[neighbor] = distance
+                        predecessor[neighbor] = current_node
+                        heappush(queue, (distance, neighbor))
+            side = 1 - side
+        return best, meeting, predecessors[0], predecessors[1]
+
+    def shortest_path_length(self, source, target):
+        """Distância entre dois nós (ids originais), como dijkstra_min_heap."""
+        length, _, _, _ = self.query(self.index[source], self.index[target])
+        return length
+
+    def shortest_path(self, source, target):
+        """Retorna (distância, caminho como lista de ids originais), com os atalhos desempacotados."""
+        length, meeting, forward, backward = self.query(self.index[source], self.index[target])
+        if meeting < 0:
+            return inf, []
+        path = [meeting]
+        while forward[path[-1]] >= 0:
+            path.append(forward[path[-1]])
+        path.reverse()
+        node = meeting
+        while backward[node] >= 0:
+            node = backward[node]
+            path.append(node)
+
+        unpacked = [path[0]]
+        for u, x in zip(path, path[1:]):
+            stack = [(u, x)]
+            while stack:
+                a, b = stack.pop()
+                m = self._arc_middle(a, b)
+                if m < 0:
+                    unpacked.append(b)
+                else:
+                    stack.append((m, b))
+                    stack.append((a, m))
+        return length, [self._node_list[i] for i in unpacked]
+
+    def _arc_middle(self, u, x):
+        # O arco u → x está em up[u] se u foi contraído antes, senão em down[x]
+        if self.rank[u] < self.rank[x]:
+            start, end = self.up_offsets[u], self.up_offsets[u + 1]
+            position = start + int(np.flatnonzero(self.up_targets[start:end] == x)[0])
+            return int(self.up_middle[position])
+        start, end = self.down_offsets[x], self.down_offsets[x + 1]
+        position = start + int(np.flatnonzero(self.down_sources[start:end] == u)[0])
+        return int(self.down_middle[position])
+
+    # ==== Serialização em disco ====
+    def save(self, path):
+        """Grava todos os vetores em um único arquivo .npz (ids dos nós precisam ser inteiros)."""
+        if self.node_ids.dtype == object:
+            raise ValueError("save exige ids de nós inteiros")
+        np.savez(
+            path, version=np.int64(FORMAT_VERSION), node_ids=self.node_ids, rank=self.rank,
+            source_edges=np.int64(self.source_edges), source_weight=np.float64(self.source_weight),
+            up_offsets=self.up_offsets, up_targets=self.up_targets,
+            up_weights=self.up_weights, up_middle=self.up_middle,
+            down_offsets=self.down_offsets, down_sources=self.down_sources,
+            down_weights=self.down_weights, down_middle=self.down_middle,
+        )
+
+    @staticmethod
+    def load(path):
+        """Lê um arquivo gravado por save."""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != FORMAT_VERSION:
+                raise ValueError(f"{path}: versão de hierarquia de contração não suportada")
+            return ContractionHierarchy(
+                data["node_ids"], data["rank"],
+                data["up_offsets"], data["up_targets"], data["up_weights"], data["up_middle"],
+                data["down_offsets"], data["down_sources"], data["down_weights"], data["down_middle"],
+                source_edges=int(data["source_edges"]), source_weight=float(data["source_weight"]),
+            )
@@ -0,0 +1,184 @@
+from array import array
+from heapq import heappush, heappop
+
+import numpy as np
+
+
+# ==== Estrutura CSR (Compressed Sparse Row) do grafo ====
+class CSRGraph:
+    """
+    Grafo em vetores planos: os vizinhos do nó i ocupam as posições
+    offsets[i]:offsets[i + 1] de neighbors e weights. Os nós são inteiros
+    0..n-1; node_ids guarda o id original (OSM) de cada índice e index faz
+    o caminho inverso. directed diz se o grafo de origem era direcionado
+    (None quando não se sabe).
+    """
+
+    def __init__(self, node_ids, offsets, neighbors, weights, x=None, y=None, directed=None):
+        self.node_ids = node_ids
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.weights = weights
+        self.x = x
+        self.y = y
+        self.directed = directed
+        self._node_list = node_ids.tolist()
+        self.index = {node: i for i, node in enumerate(self._node_list)}
+        self._lists = None
+        self._coordinate_lists = None
+        self._reverse = None
+
+    @property
+    def num_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self):
+        return len(self.neighbors)
+
+    def adjacency_lists(self):
+        """
+        Cópias dos vetores como listas do Python (feitas uma única vez): no
+        laço do Dijkstra, indexar listas é bem mais rápido que escalares NumPy.
+        """
+        if self._lists is None:
+            self._lists = (self.offsets.tolist(), self.neighbors.tolist(), self.weights.tolist())
+        return self._lists
+
+    def coordinate_lists(self):
+        """Coordenadas x (longitude) e y (latitude) como listas, feitas uma única vez."""
+        if self._coordinate_lists is None:
+            self._coordinate_lists = (self.x.tolist(), self.y.tolist())
+        return self._coordinate_lists
+
+    def reverse(self):
+        """
+        CSRGraph com todos os arcos invertidos (igual ao original em grafos
+        não-direcionados), feito uma única vez e reaproveitado entre consultas.
+        """
+        if self._reverse is None:
+            n = self.num_nodes
+            src = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.offsets))
+            order = np.lexsort((src, self.neighbors))
+            offsets = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.neighbors, minlength=n), out=offsets[1:])
+            self._reverse = CSRGraph(self.node_ids, offsets, src[order].astype(np.int32), self.weights[order],
+                                     self.x, self.y, self.directed)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def to_index(self, node):
+        return self.index[node]
+
+    def to_node(self, index):
+        return self._node_list[index]
+
+
+# ==== Função para converter um grafo NetworkX em CSR ====
+def graph_to_csr(graph, weight="length"):
+    """
+    Converte uma única vez o grafo (por exemplo, o retornado por prepare_graph)
+    para CSRGraph. Em grafos não-direcionados cada aresta vira dois arcos; em
+    multigrafos fica só a menor aresta entre cada par de nós. Laços são
+    descartados. Arestas sem o atributo recebem peso 1, como em
+    dijkstra_min_heap. As coordenadas x/y dos nós (OSMnx) são copiadas quando
+    existem em todos os nós.
+    """
+    nodes = list(graph.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+
+    edges = list(graph.edges(data=weight, default=1))
+    src = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges))
+    dst = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges))
+    wgt = np.fromiter((w for _, _, w in edges), dtype=np.float64, count=len(edges))
+
+    if not graph.is_directed():
+        src, dst, wgt = np.concatenate((src, dst)), np.concatenate((dst, src)), np.concatenate((wgt, wgt))
+    keep = src != dst
+    src, dst, wgt = src[keep], dst[keep], wgt[keep]
+
+    # Ordena por (origem, destino, peso) e mantém o primeiro de cada par
+    order = np.lexsort((wgt, dst, src))
+    src, dst, wgt = src[order], dst[order], wgt[order]
+    first = np.ones(len(src), dtype=bool)
+    first[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+    src, dst, wgt = src[first], dst[first], wgt[first]
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+
+    if all(isinstance(node, (int, np.integer)) for node in nodes):
+        node_ids = np.array(nodes, dtype=np.int64)
+    else:
+        node_ids = np.empty(n, dtype=object)
+        node_ids[:] = nodes
+
+    x = y = None
+    node_data = graph.nodes
+    if n and all("x" in node_data[node] and "y" in node_data[node] for node in nodes):
+        x = np.array([node_data[node]["x"] for node in nodes], dtype=np.float64)
+        y = np.array([node_data[node]["y"] for node in nodes], dtype=np.float64)
+
+    return CSRGraph(node_ids, offsets, dst.astype(np.int32), wgt, x, y, graph.is_directed())
+
+
+# ==== Função para Dijkstra sobre o CSR ====
+def dijkstra_csr(csr, source, target=None):
+    """
+    Dijkstra com Min-Heap sobre índices inteiros do CSRGraph, com vetores de
+    distância e predecessor pré-alocados. Se target for dado, para assim que
+    ele sai da heap (sua distância já é definitiva).
+    Retorna (distances, predecessors) como arrays NumPy; nós não alcançados
+    ficam com distância inf e predecessor -1.
+    """
+    offsets, neighbors, weights = csr.adjacency_lists()
+    n = csr.num_nodes
+    distances = array('d', [float('inf')]) * n
+    predecessors = array('q', [-1]) * n
+    distances[source] = 0.0
+
+    priority_queue = [(0.0, source)]
+    while priority_queue:
+        current_distance, current_node = heappop(priority_queue)
+        if current_distance > distances[current_node]:
+            continue
+        if current_node == target:
+            break
+        start, end = offsets[current_node], offsets[current_node + 1]
+        for neighbor, weight in zip(neighbors[start:end], weights[start:end]):
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_node
+                heappush(priority_queue, (distance, neighbor))
+
+    return np.frombuffer(distances, dtype=np.float64), np.frombuffer(predecessors, dtype=np.int64)
+
+
+# ==== Função para reconstruir o caminho a partir dos predecessores ====
+def path_from_predecessors(predecessors, source, target):
+    """Lista de índices de source até target (vazia se target não foi alcançado)."""
+    if target != source and predecessors[target] < 0:
+        return []
+    path = [target]
+    while path[-1] != source:
+        path.append(int(predecessors[path[-1]]))
+    path.reverse()
+    return path
+
+
+# ==== Funções de consulta usando os ids originais (OSM) ====
+def csr_shortest_path_length(csr, source, target):
+    """Distância entre dois nós (ids originais), como dijkstra_min_heap."""
+    s, t = csr.to_index(source), csr.to_index(target)
+    distances, _ = dijkstra_csr(csr, s, t)
+    return float(distances[t])
+
+
+def csr_shortest_path(csr, source, target):
+    """Retorna (distância, caminho como lista de ids originais)."""
+    s, t = csr.to_index(source), csr.to_index(target)
+    distances, predecessors = dijkstra_csr(csr, s, t)
+    path = path_from_predecessors(predecessors, s, t)
+    return float(distances[t]), [csr.to_node(i) for i in path]
@@ -0,0 +1,143 @@
+from heapq import heapify, heappop, heappush
+from math import inf
+
+
+# ==== Heap mínima com remoção preguiçosa e crescimento limitado ====
+class LazyMinHeap:
+    """
+    Heap mínima (heapq) com decrease-key por remoção preguiçosa: best guarda a
+    prioridade atual de cada item ainda na heap; push com prioridade menor
+    acrescenta uma nova entrada e a antiga vira obsoleta, descartada no pop.
+    Quando as entradas obsoletas passam das válidas, a heap é reconstruída só
+    com as válidas, então o tamanho fica limitado a O(nós) e não cresce até
+    O(arestas) como na heap de dijkstra_min_heap. Conta as operações feitas.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self.best = {}
+        self.pushes = 0
+        self.decreases = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.compactions = 0
+        self.max_size = 0
+
+    def __len__(self):
+        return len(self.best)
+
+    def __contains__(self, item):
+        return item in self.best
+
+    def push(self, item, priority):
+        """Insere item ou reduz sua prioridade; retorna False se a prioridade não melhorou."""
+        current = self.best.get(item)
+        if current is not None:
+            if priority >= current:
+                return False
+            self.decreases += 1
+        self.best[item] = priority
+        heappush(self._heap, (priority, item))
+        self.pushes += 1
+        if len(self._heap) > 2 * len(self.best) + 16:
+            self._heap = [(p, i) for i, p in self.best.items()]
+            heapify(self._heap)
+            self.compactions += 1
+        self.max_size = max(self.max_size, len(self._heap))
+        return True
+
+    def pop(self):
+        """Remove e retorna (prioridade, item) de menor prioridade."""
+        heap, best = self._heap, self.best
+        while True:
+            priority, item = heappop(heap)
+            if best.get(item) == priority:
+                del best[item]
+                self.pops += 1
+                return priority, item
+            self.stale_pops += 1
+
+    def operations(self):
+        return {"pushes": self.pushes, "decreases": self.decreases, "pops": self.pops,
+                "stale_pops": self.stale_pops, "compactions": self.compactions,
+                "max_size": self.max_size}
+
+
+# ==== Dijkstra com parada antecipada, vários destinos e raio ====
+def dijkstra_search(graph, source, targets=None, radius=None, weight="length"):
+    """
+    Dijkstra sobre o grafo NetworkX (como dijkstra_min_heap, inclusive com a
+    menor aresta paralela em multigrafos) usando LazyMinHeap.
+    - targets: para assim que todos os destinos forem assentados.
+    - radius: não assenta nós a distância maior que radius.
+    Retorna (distances, predecessors, heap_operations): distâncias definitivas
+    dos nós assentados, o predecessor de cada nó alcançado e os contadores da
+    heap.
+    """
+    remaining = set(targets) if targets is not None else None
+    multigraph = graph.is_multigraph()
+    distances = {}
+    predecessors = {source: None}
+    heap = LazyMinHeap()
+    heap.push(source, 0)
+
+    while heap:
+        current_distance, current_node = heap.pop()
+        if radius is not None and current_distance > radius:
+            break
+        distances[current_node] = current_distance
+        if remaining is not None:
+            remaining.discard(current_node)
+            if not remaining:
+                break
+
+        for neighbor, data in graph[current_node].items():
+            if neighbor in distances:
+                continue
+            if multigraph:
+                edge_weight = min(edge.get(weight, 1) for edge in data.values())
+            else:
+                edge_weight = data.get(weight, 1)
+            if heap.push(neighbor, current_distance + edge_weight):
+                predecessors[neighbor] = current_node
+
+    return distances, predecessors, heap.operations()
+
+
+# ==== Função para reconstruir o caminho ====
+def path_to(predecessors, target):
+    """Caminho da origem até target a partir do mapa de predecessores ([] se não alcançado)."""
+    if target not in predecessors:
+        return []
+    path = [target]
+    while predecessors[path[-1]] is not None:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return path
+
+
+# ==== Funções de consulta ====
+def dijkstra_path(graph, source, target, weight="length"):
+    """Retorna (distância, caminho, operações da heap); (inf, [], ...) se não houver caminho."""
+    distances, predecessors, operations = dijkstra_search(graph, source, [target], weight=weight)
+    if target not in distances:
+        return inf, [], operations
+    return distances[target], path_to(predecessors, target), operations
+
+
+def dijkstra_multi_target(graph, source, targets, weight="length"):
+    """Retorna ({destino: (distância, caminho)}, operações da heap), com uma única busca."""
+    distances, predecessors, operations = dijkstra_search(graph, source, targets, weight=weight)
+    routes = {}
+    for target in targets:
+        if target in distances:
+            routes[target] = (distances[target], path_to(predecessors, target))
+        else:
+            routes[target] = (inf, [])
+    return routes, operations
+
+
+def dijkstra_within_radius(graph, source, radius, weight="length"):
+    """Retorna ({nó: distância} para os nós a até radius da origem, operações da heap)."""
+    distances, _, operations = dijkstra_search(graph, source, radius=radius, weight=weight)
+    return distances, operations
@@ -0,0 +1,62 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from csr_graph import CSRGraph, dijkstra_csr, graph_to_csr, path_from_predecessors
+
+# Grafo CSR de cada processo do pool, recebido uma única vez pelo initializer
+_worker_csr = None
+
+
+def _init_worker(csr):
+    global _worker_csr
+    _worker_csr = csr
+
+
+def _single_source(csr, source, targets, with_paths):
+    # Um único Dijkstra a partir de source responde a todos os destinos
+    distances, predecessors = dijkstra_csr(csr, source)
+    row = distances[targets]
+    if not with_paths:
+        return row, None
+    return row, [path_from_predecessors(predecessors, source, t) for t in targets]
+
+
+def _worker_row(task):
+    source, targets, with_paths = task
+    return _single_source(_worker_csr, source, targets, with_paths)
+
+
+# ==== Função para a matriz de distâncias N×M ====
+def distance_matrix(graph, sources, targets, paths=False, workers=None):
+    """
+    Distâncias de cada nó de sources até cada nó de targets (ids originais),
+    com um Dijkstra de origem única por linha em vez de um por par.
+    graph pode ser um grafo NetworkX (convertido uma vez para CSR) ou um
+    CSRGraph. Com workers > 1 as origens são distribuídas por um pool de
+    processos; o CSR é enviado uma vez a cada processo e só lido por eles.
+    Retorna a matriz NumPy (len(sources) × len(targets)), com inf para pares
+    sem caminho, e, se paths=True, também paths[i][j] com a lista de ids do
+    caminho (vazia se não houver).
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph_to_csr(graph)
+    source_index = [csr.to_index(node) for node in sources]
+    target_index = np.array([csr.to_index(node) for node in targets], dtype=np.int64)
+    if workers is None:
+        workers = min(len(source_index), os.cpu_count() or 1)
+
+    if workers > 1 and len(source_index) > 1:
+        tasks = [(s, target_index, paths) for s in source_index]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(csr,)) as pool:
+            rows = list(pool.map(_worker_row, tasks))
+    else:
+        rows = [_single_source(csr, s, target_index, paths) for s in source_index]
+
+    matrix = np.empty((len(source_index), len(target_index)), dtype=np.float64)
+    for i, (row, _) in enumerate(rows):
+        matrix[i] = row
+    if not paths:
+        return matrix
+    node_paths = [[[csr.to_node(v) for v in path] for path in row_paths] for _, row_paths in rows]
+    return matrix, node_paths
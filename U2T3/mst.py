@@ -0,0 +1,267 @@
+from array import array
+
+import numpy as np
+
+
+# ==== Estrutura de conjuntos disjuntos (union-find) ====
+class DisjointSet:
+    """
+    Union-find em vetores planos: parent guarda o pai de cada elemento e
+    rank um limite superior da altura da árvore. find comprime o caminho e
+    union liga a raiz de menor rank na de maior.
+    """
+
+    def __init__(self, n):
+        self.parent = array('q', range(n))
+        self.rank = bytearray(n)
+
+    def find(self, x):
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a, b):
+        """Une os conjuntos de a e b; retorna False se já eram o mesmo."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+        return True
+
+
+# ==== Função para Kruskal sobre vetores de arestas ====
+def kruskal_arrays(n, u, v, w):
+    """
+    Kruskal sobre vetores de arestas (u, v: índices 0..n-1; w: pesos): ordena
+    os pesos com NumPy e aceita cada aresta que liga componentes diferentes.
+    Retorna os índices das arestas da floresta geradora mínima.
+    """
+    order = np.argsort(w, kind="stable")
+    sets = DisjointSet(n)
+    find, parent, rank = sets.find, sets.parent, sets.rank
+    chosen = array('q')
+    for e, a, b in zip(order.tolist(), u[order].tolist(), v[order].tolist()):
+        # union inline: no laço principal a chamada de método pesa
+        a, b = find(a), find(b)
+        if a == b:
+            continue
+        if rank[a] < rank[b]:
+            a, b = b, a
+        parent[b] = a
+        if rank[a] == rank[b]:
+            rank[a] += 1
+        chosen.append(e)
+        if len(chosen) == n - 1:
+            break
+    return np.frombuffer(chosen, dtype=np.int64) if chosen else np.empty(0, dtype=np.int64)
+
+
+# ==== Função para extrair as arestas de um grafo NetworkX ====
+def graph_edge_arrays(graph, weight="length"):
+    """
+    Retorna (nodes, edges, u, v, w): a lista de nós, a lista de arestas
+    (u, v, chave) em multigrafos ou (u, v) nos demais, e os vetores de
+    índices e pesos. Laços são mantidos; Kruskal os descarta sozinho.
+    """
+    nodes = list(graph.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    if graph.is_multigraph():
+        data = list(graph.edges(keys=True, data=weight, default=1))
+        edges = [(a, b, k) for a, b, k, _ in data]
+    else:
+        data = [(a, b, None, d) for a, b, d in graph.edges(data=weight, default=1)]
+        edges = [(a, b) for a, b, _, _ in data]
+    u = np.fromiter((index[a] for a, _, _, _ in data), dtype=np.int64, count=len(data))
+    v = np.fromiter((index[b] for _, b, _, _ in data), dtype=np.int64, count=len(data))
+    w = np.fromiter((d for _, _, _, d in data), dtype=np.float64, count=len(data))
+    return nodes, edges, u, v, w
+
+
+# ==== Função para Kruskal sobre um grafo NetworkX ====
+def kruskal_graph(graph, weight="length"):
+    """
+    Árvore (floresta) geradora mínima de um grafo não-direcionado, como
+    nx.minimum_spanning_tree: mesmo tipo de grafo, com os atributos do grafo,
+    de todos os nós e das arestas escolhidas.
+    """
+    nodes, edges, u, v, w = graph_edge_arrays(graph, weight)
+    mst = graph.__class__()
+    mst.graph.update(graph.graph)
+    mst.add_nodes_from(graph.nodes(data=True))
+    for e in kruskal_arrays(len(nodes), u, v, w).tolist():
+        edge = edges[e]
+        mst.add_edge(*edge, **graph.edges[edge])
+    return mst
+
+
+# ==== MST incremental ====
+class DynamicMST:
+    """
+    Mantém a floresta geradora mínima enquanto arestas são inseridas,
+    removidas ou mudam de peso, sem recalcular tudo:
+    - inserir (ou baratear uma aresta fora da árvore): se a aresta liga duas
+      árvores, entra; se fecha um ciclo, troca com a aresta mais pesada do
+      caminho na árvore, quando esta for mais cara.
+    - remover (ou encarecer uma aresta da árvore): a árvore se divide em
+      dois lados e entra a aresta mais barata fora da árvore que os reconecta.
+    As arestas são identificadas pelo índice devolvido em insert_edge (ou
+    pela posição nos vetores de from_arrays). Os vetores crescem dobrando de
+    capacidade, como em ArrayBST.
+    """
+
+    def __init__(self, n, capacity=1024):
+        self.n = n
+        self._count = 0
+        self.u = np.empty(capacity, dtype=np.int64)
+        self.v = np.empty(capacity, dtype=np.int64)
+        self.w = np.empty(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.in_tree = np.zeros(capacity, dtype=bool)
+        # tree[x] = {id da aresta: vizinho} para as arestas da árvore em x
+        self.tree = [{} for _ in range(n)]
+        self.total_weight = 0.0
+
+    @classmethod
+    def from_arrays(cls, n, u, v, w):
+        """Constrói com Kruskal; a aresta i dos vetores recebe o id i."""
+        mst = cls(n, capacity=max(len(u), 1))
+        m = len(u)
+        mst.u[:m], mst.v[:m], mst.w[:m] = u, v, w
+        mst.alive[:m] = True
+        mst._count = m
+        for e in kruskal_arrays(n, u, v, w).tolist():
+            mst._link(e)
+        return mst
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self._count]))
+
+    def edge_ids(self):
+        """Ids das arestas ainda presentes no grafo."""
+        return np.flatnonzero(self.alive[:self._count])
+
+    def tree_edges(self):
+        """Ids das arestas que estão na floresta geradora mínima."""
+        return np.flatnonzero(self.in_tree[:self._count])
+
+    def _grow(self):
+        capacity = 2 * len(self.u)
+        for name in ("u", "v", "w", "alive", "in_tree"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _link(self, e):
+        a, b = int(self.u[e]), int(self.v[e])
+        self.tree[a][e] = b
+        self.tree[b][e] = a
+        self.in_tree[e] = True
+        self.total_weight += float(self.w[e])
+
+    def _cut(self, e):
+        a, b = int(self.u[e]), int(self.v[e])
+        del self.tree[a][e]
+        del self.tree[b][e]
+        self.in_tree[e] = False
+        self.total_weight -= float(self.w[e])
+
+    def _tree_path_max(self, source, target):
+        """Aresta mais pesada no caminho da árvore entre source e target (None se desconectados)."""
+        parent_edge = {source: -1}
+        stack = [source]
+        while stack and target not in parent_edge:
+            node = stack.pop()
+            for e, neighbor in self.tree[node].items():
+                if neighbor not in parent_edge:
+                    parent_edge[neighbor] = e
+                    stack.append(neighbor)
+        if target not in parent_edge:
+            return None
+        heaviest, node = -1, target
+        while node != source:
+            e = parent_edge[node]
+            if heaviest < 0 or self.w[e] > self.w[heaviest]:
+                heaviest = e
+            node = int(self.u[e]) if int(self.v[e]) == node else int(self.v[e])
+        return heaviest
+
+    def _component(self, source):
+        """Nós alcançáveis a partir de source pela árvore."""
+        seen = {source}
+        stack = [source]
+        while stack:
+            for neighbor in self.tree[stack.pop()].values():
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return seen
+
+    def _offer(self, e):
+        # e (viva, fora da árvore) entra se liga duas árvores ou se é mais
+        # barata que a aresta mais pesada do ciclo que fecha
+        a, b = int(self.u[e]), int(self.v[e])
+        if a == b:
+            return
+        heaviest = self._tree_path_max(a, b)
+        if heaviest is None:
+            self._link(e)
+        elif self.w[heaviest] > self.w[e]:
+            self._cut(heaviest)
+            self._link(e)
+
+    def _reconnect(self, a):
+        # Depois de cortar uma aresta da árvore que passava por a: procura a
+        # aresta mais barata fora da árvore que cruza entre os dois lados
+        side = np.zeros(self.n, dtype=bool)
+        side[list(self._component(a))] = True
+        m = self._count
+        candidates = self.alive[:m] & ~self.in_tree[:m] & (side[self.u[:m]] != side[self.v[:m]])
+        ids = np.flatnonzero(candidates)
+        if len(ids):
+            self._link(int(ids[np.argmin(self.w[ids])]))
+
+    def insert_edge(self, a, b, weight):
+        """Insere a aresta (a, b) e atualiza a árvore; retorna o id da aresta."""
+        if self._count == len(self.u):
+            self._grow()
+        e = self._count
+        self.u[e], self.v[e], self.w[e] = a, b, weight
+        self.alive[e] = True
+        self._count += 1
+        self._offer(e)
+        return e
+
+    def delete_edge(self, e):
+        """Remove a aresta e; se estava na árvore, reconecta os dois lados."""
+        if not self.alive[e]:
+            raise KeyError(e)
+        self.alive[e] = False
+        if self.in_tree[e]:
+            self._cut(e)
+            self._reconnect(int(self.u[e]))
+
+    def update_weight(self, e, weight):
+        """Muda o peso da aresta e e atualiza a árvore."""
+        if not self.alive[e]:
+            raise KeyError(e)
+        old = self.w[e]
+        if self.in_tree[e]:
+            self.total_weight += weight - old
+            self.w[e] = weight
+            if weight > old:
+                # Encareceu: pode haver uma aresta mais barata ligando os dois lados
+                self._cut(e)
+                self._reconnect(int(self.u[e]))
+        else:
+            self.w[e] = weight
+            if weight < old:
+                self._offer(e)
@@ -0,0 +1,147 @@
+from heapq import heappush, heappop
+from math import asin, cos, inf, radians, sin, sqrt
+
+import numpy as np
+
+# Raio da Terra usado pelo OSMnx para calcular o atributo 'length' (metros)
+EARTH_RADIUS_M = 6371009
+# Margem para o arredondamento dos comprimentos no OSM: mantém a heurística
+# sempre abaixo da distância real pela malha
+HEURISTIC_FACTOR = 0.999
+
+
+# ==== Função para distância haversine (vetorizada) ====
+def haversine(lon1, lat1, lon2, lat2):
+    """Distância em metros pelo círculo máximo; aceita escalares ou arrays NumPy."""
+    lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+# ==== Função para a heurística do A* ====
+def haversine_heuristic(csr, target):
+    """
+    Função que estima a distância de cada nó até target: a distância em linha
+    reta, que nunca supera o comprimento de um caminho pelas ruas (heurística
+    admissível e consistente). É calculada só para os nós que o A* alcança.
+    Sem coordenadas no grafo, vale zero (o A* vira Dijkstra).
+    """
+    if csr.x is None:
+        return lambda node: 0.0
+    xs, ys = csr.coordinate_lists()
+    lon_t, lat_t = radians(xs[target]), radians(ys[target])
+    cos_lat_t = cos(lat_t)
+    scale = 2 * EARTH_RADIUS_M * HEURISTIC_FACTOR
+
+    def estimate(node):
+        lon, lat = radians(xs[node]), radians(ys[node])
+        a = sin((lat_t - lat) / 2) ** 2 + cos(lat) * cos_lat_t * sin((lon_t - lon) / 2) ** 2
+        return scale * asin(sqrt(min(a, 1.0)))
+    return estimate
+
+
+# ==== Função para A* sobre o CSR ====
+def astar_csr(csr, source, target):
+    """
+    A* com a heurística haversine, usando as coordenadas x/y dos nós do OSMnx.
+    Para assim que target sai da heap. Retorna (distância, caminho em
+    índices); (inf, []) se não houver caminho.
+    """
+    offsets, neighbors, weights = csr.adjacency_lists()
+    heuristic = haversine_heuristic(csr, target)
+    distances = {source: 0.0}
+    predecessors = {source: -1}
+    settled = set()
+
+    priority_queue = [(heuristic(source), source)]
+    while priority_queue:
+        _, current_node = heappop(priority_queue)
+        if current_node in settled:
+            continue
+        if current_node == target:
+            return distances[target], _walk_back(predecessors, target)
+        settled.add(current_node)
+
+        current_distance = distances[current_node]
+        start, end = offsets[current_node], offsets[current_node + 1]
+        for neighbor, weight in zip(neighbors[start:end], weights[start:end]):
+            distance = current_distance + weight
+            if distance < distances.get(neighbor, inf):
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_node
+                heappush(priority_queue, (distance + heuristic(neighbor), neighbor))
+    return inf, []
+
+
+# ==== Função para Dijkstra bidirecional sobre o CSR ====
+def bidirectional_dijkstra_csr(csr, source, target, reverse=None):
+    """
+    Expande alternadamente a partir de source (no grafo) e de target (no grafo
+    reverso) e para quando a soma dos topos das duas heaps alcança o melhor
+    caminho já encontrado. Sem reverse, usa o próprio csr se o grafo for
+    não-direcionado e csr.reverse() (guardado no csr) se for direcionado.
+    Retorna (distância, caminho).
+    """
+    if reverse is None:
+        if csr.directed is None:
+            raise ValueError("não se sabe se o grafo é direcionado: passe reverse=csr.reverse() "
+                             "ou crie o CSR com graph_to_csr")
+        reverse = csr.reverse() if csr.directed else csr
+    elif reverse.num_nodes != csr.num_nodes:
+        raise ValueError(f"reverse tem {reverse.num_nodes} nós, mas o grafo tem {csr.num_nodes}")
+    if source == target:
+        return 0.0, [source]
+    sides = (csr.adjacency_lists(), reverse.adjacency_lists())
+    distances = ({source: 0.0}, {target: 0.0})
+    predecessors = ({source: -1}, {target: -1})
+    settled = (set(), set())
+    queues = ([(0.0, source)], [(0.0, target)])
+
+    best, meeting = inf, -1
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        current_distance, current_node = heappop(queues[side])
+        if current_node in settled[side]:
+            continue
+        settled[side].add(current_node)
+
+        offsets, neighbors, weights = sides[side]
+        dist, other = distances[side], distances[1 - side]
+        start, end = offsets[current_node], offsets[current_node + 1]
+        for neighbor, weight in zip(neighbors[start:end], weights[start:end]):
+            distance = current_distance + weight
+            if distance < dist.get(neighbor, inf):
+                dist[neighbor] = distance
+                predecessors[side][neighbor] = current_node
+                heappush(queues[side], (distance, neighbor))
+            if neighbor in other and dist[neighbor] + other[neighbor] < best:
+                best, meeting = dist[neighbor] + other[neighbor], neighbor
+
+    if meeting < 0:
+        return inf, []
+    forward = _walk_back(predecessors[0], meeting)
+    backward = _walk_back(predecessors[1], meeting)
+    return best, forward + backward[-2::-1]
+
+
+def _walk_back(predecessors, node):
+    path = [node]
+    while predecessors[path[-1]] >= 0:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return path
+
+
+# ==== Funções de consulta usando os ids originais (OSM) ====
+def astar_path(csr, source, target):
+    """A* entre ids originais: retorna (distância, caminho como ids)."""
+    length, path = astar_csr(csr, csr.to_index(source), csr.to_index(target))
+    return length, [csr.to_node(i) for i in path]
+
+
+def bidirectional_path(csr, source, target, reverse=None):
+    """Dijkstra bidirecional entre ids originais: retorna (distância, caminho como ids)."""
+    length, path = bidirectional_dijkstra_csr(csr, csr.to_index(source), csr.to_index(target), reverse)
+    return length, [csr.to_node(i) for i in path]
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+from collections import OrderedDict
+
+from csr_graph import CSRGraph, dijkstra_csr, graph_to_csr, path_from_predecessors
+
+# Limite padrão de memória para as árvores em cache (bytes)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+# ==== Estatísticas do cache ====
+class RoutingStats:
+    """Contadores de acertos, faltas e despejos do cache de árvores."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shared = 0
+
+    def as_dict(self):
+        # Chamadas que aguardaram um cálculo em andamento contam como acerto
+        total = self.hits + self.shared + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "shared": self.shared,
+            "hit_rate": (self.hits + self.shared) / total if total else 0.0,
+        }
+
+
+# ==== Serviço de rotas com cache de árvores de caminhos mínimos ====
+class RoutingService:
+    """
+    Responde rotas sobre um grafo fixo guardando, para cada origem consultada,
+    a árvore de caminhos mínimos completa (distâncias e predecessores do
+    dijkstra_csr). Consultas de uma origem já em cache custam O(tamanho do
+    caminho). O cache é LRU e limitado por memória (max_bytes): ao passar do
+    limite, as árvores usadas há mais tempo são descartadas.
+    """
+
+    def __init__(self, graph, max_bytes=DEFAULT_MAX_BYTES):
+        self.csr = graph if isinstance(graph, CSRGraph) else graph_to_csr(graph)
+        self.max_bytes = max_bytes
+        self.stats = RoutingStats()
+        self._trees = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    @property
+    def cached_sources(self):
+        return len(self._trees)
+
+    @property
+    def cached_bytes(self):
+        return self._bytes
+
+    def stats_dict(self):
+        """Estatísticas do cache, incluindo ocupação atual."""
+        stats = self.stats.as_dict()
+        stats.update(cached_sources=self.cached_sources, cached_bytes=self._bytes, max_bytes=self.max_bytes)
+        return stats
+
+    def _lookup(self, source):
+        with self._lock:
+            tree = self._trees.get(source)
+            if tree is not None:
+                self._trees.move_to_end(source)
+                self.stats.hits += 1
+            return tree
+
+    def _store(self, source, tree):
+        size = tree[0].nbytes + tree[1].nbytes
+        with self._lock:
+            if source in self._trees:
+                return self._trees[source]
+            self._trees[source] = tree
+            self._bytes += size
+            # Mantém ao menos a árvore recém-calculada, mesmo acima do limite
+            while self._bytes > self.max_bytes and len(self._trees) > 1:
+                _, (distances, predecessors) = self._trees.popitem(last=False)
+                self._bytes -= distances.nbytes + predecessors.nbytes
+                self.stats.evictions += 1
+            return tree
+
+    def shortest_path_tree(self, source):
+        """(distâncias, predecessores) a partir do índice source, do cache ou calculados agora."""
+        tree = self._lookup(source)
+        if tree is not None:
+            return tree
+        with self._lock:
+            self.stats.misses += 1
+        return self._store(source, dijkstra_csr(self.csr, source))
+
+    def _answer(self, tree, s, t):
+        distances, predecessors = tree
+        path = path_from_predecessors(predecessors, s, t)
+        return float(distances[t]), [self.csr.to_node(i) for i in path]
+
+    def route_sync(self, source, target):
+        """Retorna (distância, caminho como ids originais) entre dois nós."""
+        s, t = self.csr.to_index(source), self.csr.to_index(target)
+        return self._answer(self.shortest_path_tree(s), s, t)
+
+    def distance(self, source, target):
+        """Distância entre dois nós (ids originais); inf se não houver caminho."""
+        s, t = self.csr.to_index(source), self.csr.to_index(target)
+        return float(self.shortest_path_tree(s)[0][t])
+
+    async def route(self, source, target):
+        """
+        Versão assíncrona de route_sync. O Dijkstra de uma origem ausente roda
+        no executor padrão do loop; chamadas concorrentes para a mesma origem
+        aguardam o mesmo cálculo em vez de repeti-lo.
+        """
+        s, t = self.csr.to_index(source), self.csr.to_index(target)
+        tree = self._lookup(s)
+        if tree is None:
+            pending = self._pending.get(s)
+            if pending is None:
+                with self._lock:
+                    self.stats.misses += 1
+                loop = asyncio.get_running_loop()
+                pending = loop.run_in_executor(None, dijkstra_csr, self.csr, s)
+                self._pending[s] = pending
+                try:
+                    tree = self._store(s, await pending)
+                finally:
+                    del self._pending[s]
+            else:
+                with self._lock:
+                    self.stats.shared += 1
+                tree = await pending
+        return self._answer(tree, s, t)
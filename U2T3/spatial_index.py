@@ -0,0 +1,114 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from route_search import EARTH_RADIUS_M, haversine
+
+FORMAT_VERSION = 1
+
+
+# ==== Índice espacial dos nós (KD-tree) ====
+class SpatialIndex:
+    """
+    KD-tree sobre as coordenadas dos nós, construída uma única vez por grafo.
+    Os pontos são projetados em metros (equiretangular em torno da latitude
+    média, precisa na escala de uma cidade) para a busca; as distâncias
+    devolvidas são recalculadas com haversine. Todas as consultas aceitam
+    arrays de latitudes/longitudes e respondem em lote.
+    """
+
+    def __init__(self, node_ids, x, y):
+        self.node_ids = np.asarray(node_ids)
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.reference_lat = float(np.mean(self.y)) if len(self.y) else 0.0
+        self._cos_ref = np.cos(np.radians(self.reference_lat))
+        self.tree = cKDTree(self._project(self.y, self.x))
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Índice dos nós de um grafo do OSMnx (atributos x = longitude, y = latitude)."""
+        nodes = list(graph.nodes)
+        node_data = graph.nodes
+        x = np.array([node_data[n]["x"] for n in nodes], dtype=np.float64)
+        y = np.array([node_data[n]["y"] for n in nodes], dtype=np.float64)
+        return cls(np.array(nodes), x, y)
+
+    @classmethod
+    def from_csr(cls, csr):
+        """Índice dos nós de um CSRGraph com coordenadas."""
+        if csr.x is None:
+            raise ValueError("o grafo CSR não tem coordenadas dos nós")
+        return cls(csr.node_ids, csr.x, csr.y)
+
+    def matches(self, graph):
+        """True se o índice tem exatamente os nós do grafo, com as mesmas coordenadas x/y."""
+        node_ids = self.node_ids.tolist()
+        if len(node_ids) != graph.number_of_nodes() or not all(n in graph for n in node_ids):
+            return False
+        node_data = graph.nodes
+        x = np.array([node_data[n]["x"] for n in node_ids], dtype=np.float64)
+        y = np.array([node_data[n]["y"] for n in node_ids], dtype=np.float64)
+        return np.array_equal(x, self.x) and np.array_equal(y, self.y)
+
+    def _project(self, lats, lons):
+        lats = np.radians(np.asarray(lats, dtype=np.float64))
+        lons = np.radians(np.asarray(lons, dtype=np.float64))
+        return np.column_stack((EARTH_RADIUS_M * lons * self._cos_ref, EARTH_RADIUS_M * lats)).reshape(-1, 2)
+
+    def _distances(self, lats, lons, positions):
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        if positions.ndim == 2:
+            lats, lons = lats.reshape(-1, 1), lons.reshape(-1, 1)
+        return haversine(lons, lats, self.x[positions], self.y[positions])
+
+    # ==== Consultas ====
+    def snap(self, lats, lons):
+        """Nó mais próximo de cada ponto: retorna (ids dos nós, distâncias em metros)."""
+        _, positions = self.tree.query(self._project(lats, lons))
+        return self.node_ids[positions], self._distances(np.ravel(lats), np.ravel(lons), positions)
+
+    def k_nearest(self, lats, lons, k):
+        """
+        Os k nós mais próximos de cada ponto, em ordem: arrays (pontos × k).
+        Se k passar do número de nós, devolve todos os nós (k = len(self)).
+        """
+        k = min(k, len(self))
+        _, positions = self.tree.query(self._project(lats, lons), k=k)
+        positions = positions.reshape(-1, k)
+        return self.node_ids[positions], self._distances(np.ravel(lats), np.ravel(lons), positions)
+
+    def within_radius(self, lats, lons, radius):
+        """
+        Nós a até radius metros de cada ponto. Retorna uma lista com um par
+        (ids, distâncias), ordenado por distância, para cada ponto.
+        """
+        lats, lons = np.ravel(lats), np.ravel(lons)
+        # Folga na projeção; o corte exato é feito com haversine
+        groups = self.tree.query_ball_point(self._project(lats, lons), r=radius * 1.01)
+        result = []
+        for lat, lon, positions in zip(lats, lons, groups):
+            positions = np.asarray(positions, dtype=np.int64)
+            distances = haversine(lon, lat, self.x[positions], self.y[positions])
+            keep = distances <= radius
+            order = np.argsort(distances[keep], kind="stable")
+            result.append((self.node_ids[positions[keep][order]], distances[keep][order]))
+        return result
+
+    # ==== Serialização em disco ====
+    def save(self, path):
+        """Grava ids e coordenadas em .npz, para recarregar sem o grafo."""
+        if self.node_ids.dtype == object:
+            raise ValueError("save exige ids de nós inteiros")
+        np.savez(path, version=np.int64(FORMAT_VERSION), node_ids=self.node_ids, x=self.x, y=self.y)
+
+    @staticmethod
+    def load(path):
+        """Lê um índice gravado por save (a KD-tree é montada uma vez na carga)."""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != FORMAT_VERSION:
+                raise ValueError(f"{path}: versão de índice espacial não suportada")
+            return SpatialIndex(data["node_ids"], data["x"], data["y"])
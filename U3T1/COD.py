@@ -9,6 +9,10 @@ from nltk.corpus import stopwords
 from collections import Counter
 from networkx.algorithms.community import greedy_modularity_communities
 import base64
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from centrality import centrality_dicts, centrality_table
 
 # Configurações iniciais
 nlp = spacy.load("en_core_web_sm")
@@ -81,14 +85,16 @@ def create_cooccurrence_graph(tokens, window_size=2):
 
 # Função para calcular métricas do grafo
 def analyze_graph(G, graph_name):
+    # Betweenness, closeness e degree centrality com uma única busca por origem (ver centrality.py)
+    centrality = centrality_dicts(*centrality_table(G))
     metrics = {
         "nodes": G.number_of_nodes(),
         "edges": G.number_of_edges(),
         "density": nx.density(G),
         "average_clustering": nx.average_clustering(G),
-        "betweenness_centrality": nx.betweenness_centrality(G),
-        "closeness_centrality": nx.closeness_centrality(G),
-        "degree_centrality": nx.degree_centrality(G)
+        "betweenness_centrality": centrality["betweenness_centrality"],
+        "closeness_centrality": centrality["closeness_centrality"],
+        "degree_centrality": centrality["degree_centrality"]
     }
 
     # Salvar métricas
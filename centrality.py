@@ -0,0 +1,219 @@
+"""
+Centralidades sem pesos numa única varredura, compartilhado pelos projetos
+(U1T5, U2T1, U3T1).
+
+Closeness e betweenness do NetworkX fazem, cada uma, uma busca a partir de
+cada nó. Aqui cada busca em largura (BFS) de origem única é feita uma vez,
+sobre uma adjacência indexada por inteiros, e dela saem ao mesmo tempo:
+- closeness (como nx.closeness_centrality, com wf_improved) e, opcionalmente,
+  harmonic centrality, acumuladas pelas distâncias que chegam a cada nó;
+- betweenness (acumulação de Brandes, como nx.betweenness_centrality);
+- eccentricity opcional (maior distância a partir da origem; inf se a origem
+  não alcança todos os nós).
+Degree centrality vem direto dos graus.
+
+O resultado é um array estruturado do NumPy, uma coluna por métrica, que vai
+direto para pd.DataFrame(table). Com workers > 1 as origens são distribuídas
+por um pool de processos (o script que chama precisa de if __name__ ==
+"__main__").
+
+Uso nos scripts de cada pasta:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from centrality import centrality_table
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import inf
+
+import numpy as np
+
+# Adjacência indexada de cada processo do pool, recebida uma única vez pelo initializer
+_worker_adjacency = None
+
+
+def _init_worker(adjacency):
+    global _worker_adjacency
+    _worker_adjacency = adjacency
+
+
+# ==== Função para a adjacência indexada por inteiros ====
+def index_adjacency(graph):
+    """
+    Retorna (nós, (sucessores, predecessores)): os nós na ordem do grafo e,
+    para cada índice 0..n-1, as listas de índices vizinhos, sem laços. Em
+    grafos não-direcionados as duas listas são a mesma.
+    """
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    successors = [[index[v] for v in graph[u] if v != u] for u in nodes]
+    if not graph.is_directed():
+        return nodes, (successors, successors)
+    predecessors = [[index[v] for v in graph.pred[u] if v != u] for u in nodes]
+    return nodes, (successors, predecessors)
+
+
+# ==== Acumulador de origem única (BFS + acumulação de Brandes) ====
+def accumulate_sources(adjacency, sources, betweenness=True, harmonic=False, eccentricity=False,
+                       endpoints=False, squares=False):
+    """
+    Uma BFS por origem de sources sobre a adjacência de index_adjacency,
+    acumulando as métricas pedidas. Retorna um dicionário de vetores NumPy
+    (um valor por índice de nó), somáveis entre lotes de origens:
+    distance_sum e reached_by (distâncias que chegam a cada nó e quantas
+    origens o alcançam), harmonic_sum, betweenness_sum e farthest (a
+    excentricidade de cada origem). Com squares=True também betweenness_sq,
+    a soma dos quadrados da contribuição de cada origem, para a variância da
+    betweenness amostrada (ver U1T5/betweenness.py).
+    """
+    successors, predecessors = adjacency
+    n = len(successors)
+    distance_sum = [0] * n
+    reached_by = [0] * n
+    harmonic_sum = [0.0] * n
+    betweenness_sum = [0.0] * n
+    betweenness_sq = [0.0] * n
+    farthest = [0.0] * n
+
+    for source in sources:
+        depth = [-1] * n
+        sigma = [0] * n
+        depth[source] = 0
+        sigma[source] = 1
+        order = [source]
+        for current in order:
+            current_depth = depth[current]
+            distance_sum[current] += current_depth
+            reached_by[current] += 1
+            if harmonic and current_depth:
+                harmonic_sum[current] += 1 / current_depth
+            next_depth = current_depth + 1
+            current_sigma = sigma[current]
+            for neighbor in successors[current]:
+                if depth[neighbor] < 0:
+                    depth[neighbor] = next_depth
+                    order.append(neighbor)
+                if depth[neighbor] == next_depth:
+                    sigma[neighbor] += current_sigma
+
+        if eccentricity:
+            farthest[source] = depth[order[-1]] if len(order) == n else inf
+
+        if betweenness:
+            delta = [0.0] * n
+            for current in reversed(order):
+                coefficient = (1 + delta[current]) / sigma[current]
+                previous_depth = depth[current] - 1
+                for neighbor in predecessors[current]:
+                    if depth[neighbor] == previous_depth:
+                        delta[neighbor] += sigma[neighbor] * coefficient
+                if current != source:
+                    contribution = delta[current] + 1 if endpoints else delta[current]
+                    betweenness_sum[current] += contribution
+                    if squares:
+                        betweenness_sq[current] += contribution * contribution
+            if endpoints:
+                contribution = len(order) - 1
+                betweenness_sum[source] += contribution
+                if squares:
+                    betweenness_sq[source] += contribution * contribution
+
+    return {
+        "distance_sum": np.array(distance_sum, dtype=np.float64),
+        "reached_by": np.array(reached_by, dtype=np.float64),
+        "harmonic_sum": np.array(harmonic_sum),
+        "betweenness_sum": np.array(betweenness_sum),
+        "betweenness_sq": np.array(betweenness_sq),
+        "farthest": np.array(farthest),
+    }
+
+
+def _worker_accumulate(task):
+    sources, options = task
+    return accumulate_sources(_worker_adjacency, sources, **options)
+
+
+# ==== Função para distribuir as origens por um pool de processos ====
+def sweep(adjacency, sources, workers=1, **options):
+    """
+    accumulate_sources sobre todas as origens de sources. Com workers > 1
+    (None usa todos os processadores) as origens são divididas em lotes para
+    um pool de processos, que recebe a adjacência uma única vez pelo
+    initializer, e os vetores dos lotes são somados.
+    """
+    sources = list(sources)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(sources)))
+    if workers == 1:
+        return accumulate_sources(adjacency, sources, **options)
+
+    # Alguns lotes por processo para equilibrar origens com buscas de tamanhos diferentes
+    batches = [sources[i::workers * 4] for i in range(workers * 4)]
+    tasks = [(batch, options) for batch in batches if batch]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(adjacency,)) as pool:
+        results = list(pool.map(_worker_accumulate, tasks))
+    return {name: sum(result[name] for result in results) for name in results[0]}
+
+
+def betweenness_scale(n, normalized, directed, endpoints):
+    """Fator de normalização de nx.betweenness_centrality para as somas de betweenness_sum."""
+    if normalized:
+        pairs = n * (n - 1) if endpoints else (n - 1) * (n - 2)
+        return 1 / pairs if pairs > 0 else 1.0
+    return 1.0 if directed else 0.5
+
+
+# ==== Função para a tabela de centralidades ====
+def centrality_table(graph, betweenness=True, harmonic=False, eccentricity=False,
+                     normalized=True, endpoints=False, workers=1):
+    """
+    Centralidades sem pesos de todos os nós com uma BFS por origem.
+    Retorna (nós, tabela): a tabela é um array estruturado do NumPy com uma
+    linha por nó, na ordem de nós, e as colunas degree_centrality,
+    closeness_centrality e, conforme os parâmetros, betweenness_centrality,
+    harmonic_centrality e eccentricity. normalized e endpoints valem para a
+    betweenness, como em nx.betweenness_centrality. Com workers > 1 (None
+    usa todos os processadores) as origens vão para um pool de processos.
+    """
+    nodes, adjacency = index_adjacency(graph)
+    n = len(nodes)
+    columns = ["degree_centrality", "closeness_centrality"]
+    if betweenness:
+        columns.append("betweenness_centrality")
+    if harmonic:
+        columns.append("harmonic_centrality")
+    if eccentricity:
+        columns.append("eccentricity")
+    table = np.zeros(n, dtype=[(name, np.float64) for name in columns])
+    if n == 0:
+        return nodes, table
+
+    totals = sweep(adjacency, range(n), workers, betweenness=betweenness, harmonic=harmonic,
+                   eccentricity=eccentricity, endpoints=endpoints)
+    distance_sum, reached_by = totals["distance_sum"], totals["reached_by"]
+
+    degree = np.array([d for _, d in graph.degree(nodes)], dtype=np.float64)
+    table["degree_centrality"] = degree / (n - 1) if n > 1 else 1.0
+
+    # Closeness pelas distâncias que chegam a cada nó, com a correção de Wasserman e Faust
+    others = reached_by - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        closeness = np.where(distance_sum > 0, others / distance_sum, 0.0)
+    if n > 1:
+        closeness *= others / (n - 1)
+    table["closeness_centrality"] = closeness
+
+    if betweenness:
+        table["betweenness_centrality"] = totals["betweenness_sum"] * betweenness_scale(
+            n, normalized, graph.is_directed(), endpoints)
+    if harmonic:
+        table["harmonic_centrality"] = totals["harmonic_sum"]
+    if eccentricity:
+        table["eccentricity"] = totals["farthest"]
+    return nodes, table
+
+
+# ==== Função para converter a tabela em dicionários ====
+def centrality_dicts(nodes, table):
+    """{coluna: {nó: valor}}, no formato das funções de centralidade do NetworkX."""
+    return {name: dict(zip(nodes, table[name].tolist())) for name in table.dtype.names}
@@ -0,0 +1,185 @@
+"""
+Carregador de grafos do OSMnx compartilhado pelos projetos (U1T4, U1T5, U2T3),
+com cache em disco.
+
+O primeiro load_graph de um local baixa o grafo com ox.graph_from_place e o
+grava em cache/<local>-<tipo de rede>-<simplificado|bruto>.npz. As execuções
+seguintes leem esse arquivo, sem acesso à rede. O formato é binário (NumPy
+.npz): vetores de arestas (u, v, chave, comprimento, mão única), coordenadas
+dos nós, as geometrias das arestas em vetores de pontos com deslocamentos
+(como um CSR) e, em JSON, os atributos do grafo e os demais atributos das
+arestas (osmid, highway, name, ...), que o OSMnx usa por exemplo em
+get_undirected. Atributos que não são texto, número ou listas deles são
+descartados.
+
+Para rodar totalmente offline, passe path com um arquivo local: .npz (gravado
+por save_graph), .graphml ou .osm/.xml.
+
+Uso nos scripts de cada pasta:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from osm_cache import load_graph
+"""
+import argparse
+import json
+import os
+import re
+
+import networkx as nx
+import numpy as np
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+FORMAT_VERSION = 2
+
+# Atributos de aresta gravados em vetores próprios (os demais vão em JSON)
+ARRAY_EDGE_ATTRS = ("length", "oneway", "geometry")
+
+
+# ==== Função para o nome do arquivo de cache ====
+def cache_path(place, network_type="drive", simplify=True, cache_dir=CACHE_DIR):
+    """Arquivo de cache para (local, tipo de rede, simplificação)."""
+    slug = re.sub(r"[^0-9a-z]+", "_", place.lower()).strip("_")
+    state = "simplificado" if simplify else "bruto"
+    return os.path.join(cache_dir, f"{slug}-{network_type}-{state}.npz")
+
+
+# ==== Função para gravar o grafo em formato binário ====
+def save_graph(graph, path):
+    """
+    Grava um MultiDiGraph do OSMnx em .npz: ids e coordenadas (x, y) dos nós e,
+    para cada aresta, u, v, chave, 'length', 'oneway', a geometria e os
+    demais atributos simples (osmid, highway, ...).
+    """
+    nodes = list(graph.nodes)
+    node_data = graph.nodes
+    edges = list(graph.edges(keys=True, data=True))
+    graph_attrs = {k: v for k, v in graph.graph.items() if isinstance(v, (str, int, float, bool))}
+    edge_attrs = [{k: v for k, v in d.items() if k not in ARRAY_EDGE_ATTRS and _json_value(v)}
+                  for _, _, _, d in edges]
+
+    # Geometrias: os pontos de todas as arestas em sequência; a aresta i usa
+    # geometry_xy[geometry_offsets[i]:geometry_offsets[i + 1]] (vazio se não tiver)
+    geometry_offsets = np.zeros(len(edges) + 1, dtype=np.int64)
+    points = []
+    for i, (_, _, _, d) in enumerate(edges):
+        geometry = d.get("geometry")
+        coords = list(geometry.coords) if geometry is not None else []
+        points.extend(coords)
+        geometry_offsets[i + 1] = geometry_offsets[i] + len(coords)
+    geometry_xy = np.array(points, dtype=np.float64).reshape(-1, 2)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.savez(
+        path,
+        version=np.int64(FORMAT_VERSION),
+        graph_attrs=np.frombuffer(json.dumps(graph_attrs).encode("utf-8"), dtype=np.uint8),
+        node_ids=np.array(nodes, dtype=np.int64),
+        x=np.array([node_data[n].get("x", np.nan) for n in nodes], dtype=np.float64),
+        y=np.array([node_data[n].get("y", np.nan) for n in nodes], dtype=np.float64),
+        street_count=np.array([node_data[n].get("street_count", -1) for n in nodes], dtype=np.int32),
+        u=np.array([u for u, _, _, _ in edges], dtype=np.int64),
+        v=np.array([v for _, v, _, _ in edges], dtype=np.int64),
+        key=np.array([k for _, _, k, _ in edges], dtype=np.int64),
+        length=np.array([d.get("length", np.nan) for _, _, _, d in edges], dtype=np.float64),
+        oneway=np.array([bool(d.get("oneway", False)) for _, _, _, d in edges], dtype=bool),
+        geometry_offsets=geometry_offsets,
+        geometry_xy=geometry_xy,
+        edge_attrs=np.frombuffer(json.dumps(edge_attrs).encode("utf-8"), dtype=np.uint8),
+    )
+
+
+def _json_value(value):
+    # Texto, número ou lista deles (osmid e highway viram listas após a simplificação)
+    if isinstance(value, list):
+        return all(isinstance(item, (str, int, float, bool)) for item in value)
+    return isinstance(value, (str, int, float, bool))
+
+
+# ==== Função para ler o grafo em formato binário ====
+def read_graph(path):
+    """Reconstrói o MultiDiGraph gravado por save_graph."""
+    with np.load(path, allow_pickle=False) as data:
+        if int(data["version"]) != FORMAT_VERSION:
+            raise ValueError(f"{path}: versão de cache de grafo não suportada")
+        graph = nx.MultiDiGraph(**json.loads(data["graph_attrs"].tobytes().decode("utf-8")))
+
+        nodes = zip(data["node_ids"].tolist(), data["x"].tolist(), data["y"].tolist(),
+                    data["street_count"].tolist())
+        graph.add_nodes_from(
+            (n, {"x": x, "y": y, "street_count": c} if c >= 0 else {"x": x, "y": y})
+            for n, x, y, c in nodes
+        )
+        edge_attrs = json.loads(data["edge_attrs"].tobytes().decode("utf-8"))
+        offsets = data["geometry_offsets"].tolist()
+        geometry_xy = data["geometry_xy"]
+        if len(geometry_xy):
+            from shapely.geometry import LineString
+        edges = zip(data["u"].tolist(), data["v"].tolist(), data["key"].tolist(),
+                    data["length"].tolist(), data["oneway"].tolist(), edge_attrs)
+        for i, (u, v, k, length, oneway, attrs) in enumerate(edges):
+            attrs["oneway"] = oneway
+            if length == length:
+                attrs["length"] = length
+            if offsets[i + 1] > offsets[i]:
+                attrs["geometry"] = LineString(geometry_xy[offsets[i]:offsets[i + 1]])
+            graph.add_edge(u, v, k, **attrs)
+    return graph
+
+
+# ==== Função para carregar um arquivo local ====
+def load_local_graph(path, simplify=True):
+    """Lê .npz (save_graph), .graphml ou .osm/.xml sem acessar a rede."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npz":
+        return read_graph(path)
+
+    import osmnx as ox
+    if extension == ".graphml":
+        return ox.load_graphml(path)
+    if extension in (".osm", ".xml"):
+        return ox.graph_from_xml(path, simplify=simplify)
+    raise ValueError(f"{path}: esperado um arquivo .npz, .graphml, .osm ou .xml")
+
+
+# ==== Função principal: carregar o grafo com cache ====
+def load_graph(place=None, network_type="drive", simplify=True, path=None,
+               cache_dir=CACHE_DIR, refresh=False):
+    """
+    Retorna o grafo do OSMnx para place. Se path for dado, lê o arquivo local.
+    Senão usa o cache em disco e só baixa (e grava no cache) quando o arquivo
+    não existe ou refresh=True.
+    """
+    if path is not None:
+        return load_local_graph(path, simplify)
+    if place is None:
+        raise ValueError("load_graph precisa de um local (place) ou de um arquivo local (path)")
+
+    cached = cache_path(place, network_type, simplify, cache_dir)
+    if os.path.exists(cached) and not refresh:
+        try:
+            return read_graph(cached)
+        except (KeyError, ValueError):
+            # Cache gravado por uma versão anterior do formato: baixa de novo
+            print(f"Cache {cached} desatualizado; será substituído.")
+
+    import osmnx as ox
+    print(f"Baixando '{place}' ({network_type}) do OpenStreetMap...")
+    graph = ox.graph_from_place(place, network_type=network_type, simplify=simplify)
+    save_graph(graph, cached)
+    return graph
+
+
+# ==== Execução Principal: preencher o cache antecipadamente ====
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Baixa grafos do OSMnx para o cache em disco.")
+    parser.add_argument("places", nargs="+", help="locais, ex.: \"Natal, Brazil\"")
+    parser.add_argument("--network-type", default="drive")
+    parser.add_argument("--raw", action="store_true", help="guarda o grafo sem simplificação")
+    parser.add_argument("--refresh", action="store_true", help="baixa de novo mesmo se já houver cache")
+    args = parser.parse_args()
+
+    for place in args.places:
+        graph = load_graph(place, args.network_type, not args.raw, refresh=args.refresh)
+        print(f"{place}: {graph.number_of_nodes()} nós, {graph.number_of_edges()} arestas -> "
+              f"{cache_path(place, args.network_type, not args.raw)}")